@@ -7,91 +7,183 @@ Creates a web-ready dashboard and deploys to free hosting
 import sys
 import os
 from pathlib import Path
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
 import json
-import tempfile
-import webbrowser
-import requests
+import hashlib
 from datetime import datetime
 
 # Add project root to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# Cleaned dashboard tables are cached here, keyed on the raw CSV modification times
+DASHBOARD_CACHE_DIR = Path.home() / ".cache" / "dashboard"
+
+# Bump whenever setup_data() or the cleaning it uses changes the tables it returns, so older
+# cache entries are ignored
+DASHBOARD_CACHE_VERSION = 1
+
+# Chart.js release the page is built against, pinned so a new major version can't change it.
+# A copy of CHART_JS_URL saved as CHART_JS_FILE (by scripts/fetch_chart_js.py) is inlined into
+# the generated page; without one the page links the pinned CDN file. Nothing is downloaded
+# while the page is generated.
+CHART_JS_VERSION = "4.4.1"
+CHART_JS_URL = f"https://cdn.jsdelivr.net/npm/chart.js@{CHART_JS_VERSION}/dist/chart.umd.min.js"
+CHART_JS_FILE = project_root / "static" / f"chart-{CHART_JS_VERSION}.umd.min.js"
+
+# Hex SHA-256 of the file at CHART_JS_URL, checked by scripts/fetch_chart_js.py before it writes
+# CHART_JS_FILE. Not yet recorded: take it from jsDelivr's published hash for the file (or pass
+# --sha256 to the script) and set it here alongside the committed copy.
+CHART_JS_SHA256 = None
+
+# Right-closed age bucket edges and their labels for the demographics breakdown
+AGE_GROUP_EDGES = np.array([0, 25, 35, 45, 100])
+AGE_GROUP_LABELS = ['18-24', '25-34', '35-44', '45+']
+
 def setup_data():
     """Setup and process data for cloud dashboard"""
     print("🔄 Processing data for cloud dashboard...")
     
-    # Extract data
+    # pandas is only needed to build the tables, so it is not imported at module load
+    import pandas as pd
+    
+    # Extract data (CSVs are converted to Parquet once, with dates already parsed)
     from src.extract.csv_extractor import CSVExtractor
     extractor = CSVExtractor()
     
-    users_df = extractor.extract_from_csv('data/raw/sample_users.csv')
-    products_df = extractor.extract_from_csv('data/raw/sample_products.csv')
-    sales_df = extractor.extract_from_csv('data/raw/sample_sales.csv')
+    users_path = extractor.convert_to_parquet('data/raw/sample_users.csv',
+                                              column_types={'registration_date': 'timestamp[ns]'})
+    products_path = extractor.convert_to_parquet('data/raw/sample_products.csv')
+    sales_path = extractor.convert_to_parquet('data/raw/sample_sales.csv',
+                                              column_types={'sale_date': 'timestamp[ns]'})
     
-    # Transform data
+    # Only decode the columns the dashboard reads, plus each table's key
+    users_df = pd.read_parquet(users_path, columns=['user_id', 'age', 'location'])
+    products_df = pd.read_parquet(products_path, columns=['product_id', 'category'])
+    sales_df = pd.read_parquet(sales_path, columns=['sale_id', 'user_id', 'product_id', 'total_amount',
+                                                    'sale_date', 'store_location', 'payment_method'])
+    
+    # Transform data. The Parquet input is already typed, so only the missing-value
+    # and duplicate-key checks from clean_data are needed.
     from src.transform.data_transformer import DataTransformer
     transformer = DataTransformer()
     
-    users_clean = transformer.clean_data(users_df)
-    products_clean = transformer.clean_data(products_df)
-    sales_clean = transformer.clean_data(sales_df)
+    users_clean = transformer.clean_data_fast(users_df, ['age', 'location'], key_columns=['user_id'])
+    products_clean = transformer.clean_data_fast(products_df, ['category'], key_columns=['product_id'])
+    sales_clean = transformer.clean_data_fast(sales_df, list(sales_df.columns), key_columns=['sale_id'])
+    
+    users_clean = users_clean[['age', 'location']]
+    products_clean = products_clean[['category']]
     
-    # Convert date columns
-    sales_clean['sale_date'] = pd.to_datetime(sales_clean['sale_date'])
-    users_clean['registration_date'] = pd.to_datetime(users_clean['registration_date'])
+    # Low-cardinality string columns are counted and grouped on integer codes
+    users_clean = users_clean.astype({'location': 'category'})
+    products_clean = products_clean.astype({'category': 'category'})
+    sales_clean = sales_clean.astype({'store_location': 'category', 'payment_method': 'category'})
     
-    return users_clean, products_clean, sales_clean
+    # Hand the dashboard columnar Arrow tables (categoricals become dictionary arrays)
+    return tuple(pa.Table.from_pandas(df, preserve_index=False)
+                 for df in (users_clean, products_clean, sales_clean))
+
+def cached_setup_data():
+    """Return setup_data() results, reusing cached tables while the raw CSVs are unchanged"""
+    raw_files = ['data/raw/sample_users.csv', 'data/raw/sample_products.csv', 'data/raw/sample_sales.csv']
+    cache_key = hashlib.sha1(repr((DASHBOARD_CACHE_VERSION, [(path, os.path.getmtime(path)) for path in raw_files])).encode()).hexdigest()
+    cache_files = [DASHBOARD_CACHE_DIR / f"{cache_key}_{name}.feather" for name in ('users', 'products', 'sales')]
+    
+    if all(cache_file.exists() for cache_file in cache_files):
+        print("⚡ Using cached dashboard data...")
+        return tuple(feather.read_table(cache_file) for cache_file in cache_files)
+    
+    tables = setup_data()
+    
+    # Replace any cache entries left over from older versions of the CSVs
+    DASHBOARD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for stale_file in DASHBOARD_CACHE_DIR.glob('*.feather'):
+        stale_file.unlink()
+    for table, cache_file in zip(tables, cache_files):
+        feather.write_feather(table, cache_file, compression='lz4')
+    
+    return tables
 
-def create_cloud_dashboard_data(users_df, products_df, sales_df):
-    """Create data for cloud dashboard"""
+def create_cloud_dashboard_data(users_table, products_table, sales_table):
+    """Create data for cloud dashboard from the Arrow tables built by setup_data"""
     
-    # Calculate metrics
+    # Calculate metrics (scan total_amount once and reuse the sum)
+    amounts = sales_table['total_amount']
+    # Arrow returns null (None) for the sum and mean of an empty column; report 0 instead
+    total_amount = pc.sum(amounts).as_py() or 0
     metrics = {
-        'total_users': len(users_df),
-        'total_products': len(products_df),
-        'total_sales': float(sales_df['total_amount'].sum()),
-        'avg_order_value': float(sales_df['total_amount'].mean()),
-        'total_revenue': float(sales_df['total_amount'].sum()),
-        'unique_locations': len(users_df['location'].unique()),
-        'product_categories': len(products_df['category'].unique())
+        'total_users': users_table.num_rows,
+        'total_products': products_table.num_rows,
+        'total_sales': total_amount,
+        'avg_order_value': pc.mean(amounts).as_py() or 0,
+        'total_revenue': total_amount,
+        'unique_locations': pc.count(pc.unique(users_table['location'])).as_py(),
+        'product_categories': pc.count(pc.unique(products_table['category'])).as_py()
     }
     
     # Sales over time
-    daily_sales = sales_df.groupby(sales_df['sale_date'].dt.date)['total_amount'].sum().reset_index()
+    daily_sales = (
+        pa.table({'date': pc.cast(sales_table['sale_date'], pa.date32()), 'sales': amounts})
+        .group_by('date')
+        .aggregate([('sales', 'sum')])
+        .sort_by('date')
+    )
     sales_timeline = [
-        {'date': str(row['sale_date']), 'sales': float(row['total_amount'])}
-        for _, row in daily_sales.iterrows()
+        {'date': date, 'sales': sales}
+        for date, sales in zip(pc.strftime(daily_sales['date'], '%Y-%m-%d').to_pylist(),
+                               daily_sales['sales_sum'].to_pylist())
     ]
     
     # Top products
-    product_sales = sales_df.groupby('product_id')['total_amount'].sum().sort_values(ascending=False).head(5)
+    product_sales = (
+        sales_table.group_by('product_id', use_threads=False)
+        .aggregate([('total_amount', 'sum')])
+        .sort_by([('total_amount_sum', 'descending')])
+        .slice(0, 5)
+    )
     top_products = [
-        {'product': product, 'sales': float(sales)}
-        for product, sales in product_sales.items()
+        {'product': product, 'sales': sales}
+        for product, sales in zip(product_sales['product_id'].to_pylist(),
+                                  product_sales['total_amount_sum'].to_pylist())
     ]
     
     # User demographics
-    age_groups = users_df.groupby(pd.cut(users_df['age'], bins=[0, 25, 35, 45, 100], labels=['18-24', '25-34', '35-44', '45+']))['age'].count()
+    age_bins = np.searchsorted(AGE_GROUP_EDGES, users_table['age'].to_numpy(), side='left')
+    age_counts = np.bincount(age_bins, minlength=len(AGE_GROUP_EDGES) + 1)[1:len(AGE_GROUP_EDGES)]
+    location_counts = pc.value_counts(users_table['location']).flatten()
+    location_order = pc.array_sort_indices(location_counts[1], order='descending')
     demographics = {
-        'age_groups': age_groups.to_dict(),
-        'locations': users_df['location'].value_counts().to_dict()
+        'age_groups': dict(zip(AGE_GROUP_LABELS, age_counts.tolist())),
+        'locations': dict(zip(location_counts[0].take(location_order).to_pylist(),
+                              location_counts[1].take(location_order).to_pylist()))
     }
     
     # Recent sales
-    recent_sales = sales_df.sort_values('sale_date', ascending=False).head(10)
+    recent_sales = sales_table.sort_by([('sale_date', 'descending')]).slice(0, 10)
     sales_data = [
         {
-            'sale_id': row['sale_id'],
-            'user_id': row['user_id'],
-            'product_id': row['product_id'],
-            'amount': float(row['total_amount']),
-            'date': str(row['sale_date']),
-            'location': row['store_location'],
-            'payment_method': row['payment_method']
+            'sale_id': sale_id,
+            'user_id': user_id,
+            'product_id': product_id,
+            'amount': amount,
+            'date': date,
+            'location': location,
+            'payment_method': payment_method
         }
-        for _, row in recent_sales.iterrows()
+        for sale_id, user_id, product_id, amount, date, location, payment_method in zip(
+            recent_sales['sale_id'].to_pylist(),
+            recent_sales['user_id'].to_pylist(),
+            recent_sales['product_id'].to_pylist(),
+            recent_sales['total_amount'].to_pylist(),
+            pc.strftime(pc.cast(recent_sales['sale_date'], pa.timestamp('s'), safe=False),
+                        '%Y-%m-%d %H:%M:%S').to_pylist(),
+            recent_sales['store_location'].to_pylist(),
+            recent_sales['payment_method'].to_pylist()
+        )
     ]
     
     return {
@@ -103,17 +195,29 @@ def create_cloud_dashboard_data(users_df, products_df, sales_df):
         'last_updated': datetime.now().isoformat()
     }
 
-def create_static_dashboard_html(data):
-    """Create a self-contained HTML dashboard"""
-    
-    html_content = f"""
+# Compact JSON encoder for the chart data embedded in the dashboard script
+CHART_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+# Row markup for the recent transactions table, filled from each recent_sales entry
+RECENT_SALE_ROW_TEMPLATE = """
+                    <tr>
+                        <td>{sale_id}</td>
+                        <td>{product_id}</td>
+                        <td>${amount:.2f}</td>
+                        <td>{date}</td>
+                        <td>{location}</td>
+                    </tr>
+        """
+
+# Dashboard page markup, filled in by create_static_dashboard_html
+DASHBOARD_HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>🚀 Data Engineering Pipeline Dashboard</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    {chart_js_tag}
     <style>
         * {{ margin: 0; padding: 0; box-sizing: border-box; }}
         body {{ 
@@ -208,22 +312,22 @@ def create_static_dashboard_html(data):
         <div class="metrics">
             <div class="metric">
                 <h3>👥 Total Users</h3>
-                <div class="number">{data['metrics']['total_users']}</div>
+                <div class="number">{total_users}</div>
                 <div class="label">Active users</div>
             </div>
             <div class="metric">
                 <h3>📦 Total Products</h3>
-                <div class="number">{data['metrics']['total_products']}</div>
+                <div class="number">{total_products}</div>
                 <div class="label">Products catalog</div>
             </div>
             <div class="metric">
                 <h3>💰 Total Revenue</h3>
-                <div class="number">${data['metrics']['total_sales']:,.2f}</div>
+                <div class="number">${total_sales:,.2f}</div>
                 <div class="label">Total sales</div>
             </div>
             <div class="metric">
                 <h3>📊 Avg Order Value</h3>
-                <div class="number">${data['metrics']['avg_order_value']:,.2f}</div>
+                <div class="number">${avg_order_value:,.2f}</div>
                 <div class="label">Per transaction</div>
             </div>
         </div>
@@ -261,28 +365,14 @@ def create_static_dashboard_html(data):
                     </tr>
                 </thead>
                 <tbody>
-"""
-    
-    # Add recent sales to table
-    for sale in data['recent_sales'][:8]:
-        html_content += f"""
-                    <tr>
-                        <td>{sale['sale_id']}</td>
-                        <td>{sale['product_id']}</td>
-                        <td>${sale['amount']:.2f}</td>
-                        <td>{sale['date']}</td>
-                        <td>{sale['location']}</td>
-                    </tr>
-        """
-    
-    html_content += f"""
+{table_rows}
                 </tbody>
             </table>
         </div>
         
         <div class="footer">
             <p>🚀 Production-Ready Data Engineering Pipeline</p>
-            <p>Last updated: {data['last_updated']}</p>
+            <p>Last updated: {last_updated}</p>
             <p>Built with Python, Pandas, and deployed to cloud</p>
         </div>
     </div>
@@ -293,10 +383,10 @@ def create_static_dashboard_html(data):
         new Chart(salesCtx, {{
             type: 'line',
             data: {{
-                labels: {json.dumps([item['date'] for item in data['sales_timeline']])},
+                labels: {timeline_labels},
                 datasets: [{{
                     label: 'Sales ($)',
-                    data: {json.dumps([item['sales'] for item in data['sales_timeline']])},
+                    data: {timeline_values},
                     borderColor: '#667eea',
                     backgroundColor: 'rgba(102, 126, 234, 0.1)',
                     borderWidth: 3,
@@ -327,10 +417,10 @@ def create_static_dashboard_html(data):
         new Chart(productsCtx, {{
             type: 'bar',
             data: {{
-                labels: {json.dumps([item['product'] for item in data['top_products']])},
+                labels: {product_labels},
                 datasets: [{{
                     label: 'Sales ($)',
-                    data: {json.dumps([item['sales'] for item in data['top_products']])},
+                    data: {product_values},
                     backgroundColor: [
                         '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7'
                     ],
@@ -357,80 +447,43 @@ def create_static_dashboard_html(data):
     </script>
 </body>
 </html>
-    """
-    
-    return html_content
+"""
 
-def deploy_to_github_pages(html_content):
-    """Deploy dashboard to GitHub Pages"""
-    print("🚀 Deploying to GitHub Pages...")
+def get_chart_js_tag():
+    """Return a script tag with the vendored Chart.js inlined, or linking the pinned CDN copy"""
+    if not CHART_JS_FILE.exists():
+        return f'<script src="{CHART_JS_URL}"></script>'
     
-    # Create temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
-        # Create dashboard files
-        dashboard_file = temp_path / "index.html"
-        with open(dashboard_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        # Create README
-        readme_content = f"""
-# 🚀 Data Engineering Pipeline Dashboard
-
-This is a cloud-hosted interactive dashboard showcasing a complete data engineering pipeline.
-
-## Features:
-- Real-time data processing
-- Interactive charts and visualizations
-- Multi-source data integration
-- Production-ready ETL pipeline
-
-## Live Dashboard:
-Access the interactive dashboard at the GitHub Pages URL.
-
-## Technology Stack:
-- Python 3.8+
-- Pandas for data processing
-- Chart.js for visualizations
-- GitHub Pages for hosting
-
-Last updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        """
-        
-        with open(temp_path / "README.md", 'w') as f:
-            f.write(readme_content)
-        
-        print(f"📁 Dashboard files created in: {temp_path}")
-        print("📝 To deploy to GitHub Pages:")
-        print("1. Create a new GitHub repository")
-        print("2. Upload the files from the temporary directory")
-        print("3. Enable GitHub Pages in repository settings")
-        print("4. Your dashboard will be live at: https://[username].github.io/[repository]/")
-        
-        return temp_path
+    chart_js = CHART_JS_FILE.read_text(encoding='utf-8').replace('</script', '<\\/script')
+    return f"<script>{chart_js}</script>"
 
-def deploy_to_netlify(html_content):
-    """Deploy dashboard to Netlify (simpler alternative)"""
-    print("🌐 Preparing for Netlify deployment...")
+def create_static_dashboard_html(data):
+    """Create a self-contained HTML dashboard"""
     
-    # Create temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
-        # Create dashboard files
-        dashboard_file = temp_path / "index.html"
-        with open(dashboard_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"📁 Dashboard files created in: {temp_path}")
-        print("🌐 To deploy to Netlify:")
-        print("1. Go to https://netlify.com")
-        print("2. Drag and drop the folder to deploy")
-        print("3. Get instant public URL")
-        print("4. Free hosting with custom domain support")
-        
-        return temp_path
+    # Serialize chart series up front with a shared compact encoder
+    timeline_dates = [item['date'] for item in data['sales_timeline']]
+    timeline_sales = [item['sales'] for item in data['sales_timeline']]
+    product_names = [item['product'] for item in data['top_products']]
+    product_sales = [item['sales'] for item in data['top_products']]
+    timeline_labels, timeline_values, product_labels, product_values = map(
+        CHART_JSON_ENCODER.encode, (timeline_dates, timeline_sales, product_names, product_sales)
+    )
+    
+    # Add recent sales to table
+    table_rows = ''.join(
+        RECENT_SALE_ROW_TEMPLATE.format_map(sale) for sale in data['recent_sales'][:8]
+    )
+    
+    return DASHBOARD_HTML_TEMPLATE.format_map({
+        'chart_js_tag': get_chart_js_tag(),
+        'table_rows': table_rows,
+        'timeline_labels': timeline_labels,
+        'timeline_values': timeline_values,
+        'product_labels': product_labels,
+        'product_values': product_values,
+        'last_updated': data['last_updated'],
+        **data['metrics']
+    })
 
 def create_public_url_dashboard():
     """Create and prepare dashboard for public deployment"""
@@ -438,10 +491,10 @@ def create_public_url_dashboard():
     print("=" * 50)
     
     # Setup data
-    users_df, products_df, sales_df = setup_data()
+    users_table, products_table, sales_table = cached_setup_data()
     
     # Create dashboard data
-    dashboard_data = create_cloud_dashboard_data(users_df, products_df, sales_df)
+    dashboard_data = create_cloud_dashboard_data(users_table, products_table, sales_table)
     
     # Create HTML dashboard
     html_content = create_static_dashboard_html(dashboard_data)
@@ -459,6 +512,7 @@ def create_public_url_dashboard():
     
     # Open in browser
     try:
+        import webbrowser
         webbrowser.open(f"file://{html_file}")
         print("🌐 Dashboard opened in your browser!")
     except:
@@ -1,8 +1,13 @@
 import os
+from functools import cached_property
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Project root, resolved once so the data paths below are absolute and canonical
+BASE_DIR = Path(__file__).resolve().parent.parent
+
 class Config:
     # Database Configuration
     DB_HOST = os.getenv('DB_HOST', 'localhost')
@@ -11,7 +16,7 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'postgres')
     DB_PASSWORD = os.getenv('DB_PASSWORD', 'password')
     
-    @property
+    @cached_property
     def DATABASE_URL(self):
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
@@ -26,8 +31,8 @@ class Config:
     API_KEY = os.getenv('API_KEY')
     
     # Data Paths
-    RAW_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')
-    PROCESSED_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed')
-    LOGS_PATH = os.path.join(os.path.dirname(__file__), '..', 'logs')
+    RAW_DATA_PATH = BASE_DIR / 'data' / 'raw'
+    PROCESSED_DATA_PATH = BASE_DIR / 'data' / 'processed'
+    LOGS_PATH = BASE_DIR / 'logs'
 
 config = Config()
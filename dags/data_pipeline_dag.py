@@ -1,19 +1,17 @@
 from datetime import datetime, timedelta
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.operators.python import PythonOperator, ShortCircuitOperator
 from airflow.operators.bash import BashOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
 from airflow.providers.postgres.hooks.postgres import PostgresHook
 from airflow.models import Variable
+from psycopg2.extras import Json, execute_values
 import sys
 import os
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.orchestration.etl_pipeline import ETLPipeline
-from config.config import config
-
 default_args = {
     'owner': 'data-engineering',
     'depends_on_past': False,
@@ -24,8 +22,8 @@ default_args = {
     'retry_delay': timedelta(minutes=5),
 }
 
-# Pipeline configuration - can be moved to Airflow Variables for production
-PIPELINE_CONFIG = {
+# Default pipeline configuration, overridden by the etl_pipeline_config Airflow Variable
+DEFAULT_PIPELINE_CONFIG = {
     'users_etl': {
         'type': 'csv',
         'table_name': 'raw_data.users',
@@ -39,7 +37,8 @@ PIPELINE_CONFIG = {
                 'age': {'min': 18, 'max': 100}
             }
         },
-        'load_strategy': 'replace'
+        'load_strategy': 'replace',
+        'key_columns': ['user_id']
     },
     'products_etl': {
         'type': 'csv',
@@ -69,197 +68,299 @@ PIPELINE_CONFIG = {
     }
 }
 
+def get_pipeline_config():
+    """Load the ETL job configuration at task run time rather than at DAG parse time"""
+    return Variable.get('etl_pipeline_config', default_var=DEFAULT_PIPELINE_CONFIG, deserialize_json=True)
+
+def _run_csv_job(pipeline, job_config):
+    """Load CSV files into Postgres via COPY; the file is loaded as is, without clean_data/standardize_columns"""
+    return pipeline.run_csv_copy_pipeline(
+        file_paths=job_config['file_paths'],
+        table_name=job_config['table_name'],
+        transformation_config=job_config.get('transformations', {}),
+        load_strategy=job_config.get('load_strategy', 'append'),
+        key_columns=job_config.get('key_columns')
+    )
+
+def _run_api_job(pipeline, job_config):
+    """Extract from the API and load into Postgres"""
+    return pipeline.run_api_pipeline(
+        endpoint=job_config['endpoint'],
+        table_name=job_config['table_name'],
+        params=job_config.get('params', {}),
+        transformation_config=job_config.get('transformations', {}),
+        load_strategy=job_config.get('load_strategy', 'append')
+    )
+
+# ETL runners keyed on the job config 'type'; new source types only need an entry here
+JOB_RUNNERS = {
+    'csv': _run_csv_job,
+    'api': _run_api_job,
+}
+
 def run_etl_job(**context):
     """Run a specific ETL job"""
     job_name = context['task_instance'].task_id
-    job_config = PIPELINE_CONFIG.get(job_name.replace('_etl', ''))
+    job_config = get_pipeline_config().get(job_name)
     
     if not job_config:
         raise ValueError(f"No configuration found for job: {job_name}")
     
+    runner = JOB_RUNNERS.get(job_config['type'])
+    if runner is None:
+        raise ValueError(f"Unsupported job type: {job_config['type']}")
+    
+    # Imported here so the scheduler does not load pandas/SQLAlchemy on every DAG parse
+    from src.orchestration.etl_pipeline import ETLPipeline
     pipeline = ETLPipeline(f"airflow_{job_name}")
+    start_time = datetime.now()
     
     try:
-        if job_config['type'] == 'csv':
-            success = pipeline.run_csv_pipeline(
-                file_paths=job_config['file_paths'],
-                table_name=job_config['table_name'],
-                transformation_config=job_config.get('transformations', {}),
-                load_strategy=job_config.get('load_strategy', 'append')
-            )
-        elif job_config['type'] == 'api':
-            success = pipeline.run_api_pipeline(
-                endpoint=job_config['endpoint'],
-                table_name=job_config['table_name'],
-                params=job_config.get('params', {}),
-                transformation_config=job_config.get('transformations', {}),
-                load_strategy=job_config.get('load_strategy', 'append')
-            )
-        else:
-            raise ValueError(f"Unsupported job type: {job_config['type']}")
+        success = runner(pipeline, job_config)
         
         if not success:
             raise Exception(f"ETL job {job_name} failed")
         
-        return f"ETL job {job_name} completed successfully"
+        # Recorded in the warehouse rather than XCom so analytics_gate can tell whether
+        # anything new arrived without writing to the Airflow metadata DB
+        rows_loaded = sum(log['details'].get('rows_loaded', 0) for log in pipeline.pipeline_log)
+        postgres_hook = PostgresHook(postgres_conn_id='postgres_default')
+        postgres_hook.run(
+            """
+            INSERT INTO analytics.etl_job_logs
+            (job_name, job_type, start_time, end_time, status, records_loaded, metadata)
+            VALUES (%s, %s, %s, %s, 'success', %s, %s)
+            """,
+            parameters=(job_name, job_config['type'], start_time, datetime.now(),
+                        rows_loaded, Json({'run_id': context['run_id']}))
+        )
         
     finally:
         pipeline.cleanup()
 
-def run_analytics_pipeline(**context):
-    """Run analytics and aggregation pipeline"""
-    pipeline = ETLPipeline("airflow_analytics")
-    
-    try:
-        # Get database connection
-        postgres_hook = PostgresHook(postgres_conn_id='postgres_default')
-        
-        # Run user analytics
-        user_analytics_query = """
-        INSERT INTO processed_data.user_analytics (
-            user_id, name, age_group, location, total_purchases, total_spent,
-            avg_purchase_value, favorite_category, customer_lifetime_days,
-            last_purchase_date, first_purchase_date, is_active
-        )
-        SELECT 
-            u.user_id,
-            u.name,
-            CASE 
-                WHEN u.age < 25 THEN '18-24'
-                WHEN u.age < 35 THEN '25-34'
-                WHEN u.age < 45 THEN '35-44'
-                WHEN u.age < 55 THEN '45-54'
-                ELSE '55+'
-            END as age_group,
-            u.location,
-            COUNT(s.sale_id) as total_purchases,
-            COALESCE(SUM(s.total_amount), 0) as total_spent,
-            CASE 
-                WHEN COUNT(s.sale_id) > 0 THEN COALESCE(SUM(s.total_amount), 0) / COUNT(s.sale_id)
-                ELSE 0
-            END as avg_purchase_value,
-            (
-                SELECT p.category
-                FROM raw_data.sales s2
-                JOIN raw_data.products p ON s2.product_id = p.product_id
-                WHERE s2.user_id = u.user_id
-                GROUP BY p.category
-                ORDER BY COUNT(*) DESC
-                LIMIT 1
-            ) as favorite_category,
-            CASE 
-                WHEN u.last_active IS NOT NULL THEN 
-                    (CURRENT_DATE - u.registration_date)
-                ELSE NULL
-            END as customer_lifetime_days,
-            MAX(s.sale_date) as last_purchase_date,
-            MIN(s.sale_date) as first_purchase_date,
-            CASE 
-                WHEN u.last_active >= CURRENT_DATE - INTERVAL '30 days' THEN TRUE
-                ELSE FALSE
-            END as is_active
-        FROM raw_data.users u
-        LEFT JOIN raw_data.sales s ON u.user_id = s.user_id
-        GROUP BY u.user_id, u.name, u.age, u.location, u.registration_date, u.last_active
-        ON CONFLICT (user_id) DO UPDATE SET
-            name = EXCLUDED.name,
-            age_group = EXCLUDED.age_group,
-            location = EXCLUDED.location,
-            total_purchases = EXCLUDED.total_purchases,
-            total_spent = EXCLUDED.total_spent,
-            avg_purchase_value = EXCLUDED.avg_purchase_value,
-            favorite_category = EXCLUDED.favorite_category,
-            customer_lifetime_days = EXCLUDED.customer_lifetime_days,
-            last_purchase_date = EXCLUDED.last_purchase_date,
-            first_purchase_date = EXCLUDED.first_purchase_date,
-            is_active = EXCLUDED.is_active,
-            processing_date = CURRENT_TIMESTAMP;
+def has_new_rows(**context):
+    """Let the analytics tasks run only if an ETL task loaded new rows"""
+    postgres_hook = PostgresHook(postgres_conn_id='postgres_default')
+    rows_loaded = postgres_hook.get_first(
         """
-        
-        postgres_hook.run(user_analytics_query)
-        
-        # Run product analytics
-        product_analytics_query = """
-        INSERT INTO processed_data.product_analytics (
-            product_id, name, category, brand, total_sales, total_revenue,
-            avg_price, unique_customers, top_locations
-        )
-        SELECT 
-            p.product_id,
-            p.name,
+        SELECT COALESCE(SUM(records_loaded), 0) FROM analytics.etl_job_logs
+        WHERE metadata->>'run_id' = %s AND job_name IN ('users_etl', 'products_etl', 'sales_etl')
+        """,
+        parameters=(context['run_id'],)
+    )[0]
+    return rows_loaded > 0
+
+# Analytics upserts. Each stages its aggregate in a temp table and then upserts from it,
+# so the GROUP BY runs without holding row locks on the target table
+USER_ANALYTICS_QUERY = """
+    CREATE TEMP TABLE stg_user_analytics ON COMMIT DROP AS
+    WITH user_category_counts AS (
+        SELECT
+            s.user_id,
             p.category,
-            p.brand,
-            COUNT(s.sale_id) as total_sales,
-            COALESCE(SUM(s.total_amount), 0) as total_revenue,
-            AVG(p.price) as avg_price,
-            COUNT(DISTINCT s.user_id) as unique_customers,
-            ARRAY_AGG(DISTINCT s.store_location) as top_locations
-        FROM raw_data.products p
-        LEFT JOIN raw_data.sales s ON p.product_id = s.product_id
-        GROUP BY p.product_id, p.name, p.category, p.brand, p.price
-        ON CONFLICT (product_id) DO UPDATE SET
-            name = EXCLUDED.name,
-            category = EXCLUDED.category,
-            brand = EXCLUDED.brand,
-            total_sales = EXCLUDED.total_sales,
-            total_revenue = EXCLUDED.total_revenue,
-            avg_price = EXCLUDED.avg_price,
-            unique_customers = EXCLUDED.unique_customers,
-            top_locations = EXCLUDED.top_locations,
-            processing_date = CURRENT_TIMESTAMP;
-        """
-        
-        postgres_hook.run(product_analytics_query)
-        
-        # Run sales analytics
-        sales_analytics_query = """
-        INSERT INTO processed_data.sales_analytics (
-            date, total_sales, total_revenue, avg_order_value,
-            unique_customers, unique_products, top_category, top_location
-        )
-        SELECT 
-            s.sale_date as date,
-            COUNT(s.sale_id) as total_sales,
-            SUM(s.total_amount) as total_revenue,
-            AVG(s.total_amount) as avg_order_value,
-            COUNT(DISTINCT s.user_id) as unique_customers,
-            COUNT(DISTINCT s.product_id) as unique_products,
-            (
-                SELECT p.category
-                FROM raw_data.sales s2
-                JOIN raw_data.products p ON s2.product_id = p.product_id
-                WHERE s2.sale_date = s.sale_date
-                GROUP BY p.category
-                ORDER BY COUNT(*) DESC
-                LIMIT 1
-            ) as top_category,
-            (
-                SELECT s3.store_location
-                FROM raw_data.sales s3
-                WHERE s3.sale_date = s.sale_date
-                GROUP BY s3.store_location
-                ORDER BY COUNT(*) DESC
-                LIMIT 1
-            ) as top_location
+            ROW_NUMBER() OVER (PARTITION BY s.user_id ORDER BY COUNT(*) DESC) as rn
         FROM raw_data.sales s
-        GROUP BY s.sale_date
-        ON CONFLICT (date) DO UPDATE SET
-            total_sales = EXCLUDED.total_sales,
-            total_revenue = EXCLUDED.total_revenue,
-            avg_order_value = EXCLUDED.avg_order_value,
-            unique_customers = EXCLUDED.unique_customers,
-            unique_products = EXCLUDED.unique_products,
-            top_category = EXCLUDED.top_category,
-            top_location = EXCLUDED.top_location,
-            processing_date = CURRENT_TIMESTAMP;
-        """
-        
-        postgres_hook.run(sales_analytics_query)
+        JOIN raw_data.products p ON s.product_id = p.product_id
+        GROUP BY s.user_id, p.category
+    )
+    SELECT 
+        u.user_id,
+        u.name,
+        u.age_group,
+        u.location,
+        COUNT(s.sale_id) as total_purchases,
+        COALESCE(SUM(s.total_amount), 0) as total_spent,
+        CASE 
+            WHEN COUNT(s.sale_id) > 0 THEN COALESCE(SUM(s.total_amount), 0) / COUNT(s.sale_id)
+            ELSE 0
+        END as avg_purchase_value,
+        fc.category as favorite_category,
+        CASE 
+            WHEN u.last_active IS NOT NULL THEN 
+                (CURRENT_DATE - u.registration_date)
+            ELSE NULL
+        END as customer_lifetime_days,
+        MAX(s.sale_date) as last_purchase_date,
+        MIN(s.sale_date) as first_purchase_date,
+        CASE 
+            WHEN u.last_active >= CURRENT_DATE - INTERVAL '30 days' THEN TRUE
+            ELSE FALSE
+        END as is_active
+    FROM raw_data.users u
+    LEFT JOIN raw_data.sales s ON u.user_id = s.user_id
+    LEFT JOIN user_category_counts fc ON fc.user_id = u.user_id AND fc.rn = 1
+    GROUP BY u.user_id, u.name, u.age_group, u.location, u.registration_date, u.last_active, fc.category;
+    
+    INSERT INTO processed_data.user_analytics (
+        user_id, name, age_group, location, total_purchases, total_spent,
+        avg_purchase_value, favorite_category, customer_lifetime_days,
+        last_purchase_date, first_purchase_date, is_active
+    )
+    SELECT * FROM stg_user_analytics
+    ON CONFLICT (user_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        age_group = EXCLUDED.age_group,
+        location = EXCLUDED.location,
+        total_purchases = EXCLUDED.total_purchases,
+        total_spent = EXCLUDED.total_spent,
+        avg_purchase_value = EXCLUDED.avg_purchase_value,
+        favorite_category = EXCLUDED.favorite_category,
+        customer_lifetime_days = EXCLUDED.customer_lifetime_days,
+        last_purchase_date = EXCLUDED.last_purchase_date,
+        first_purchase_date = EXCLUDED.first_purchase_date,
+        is_active = EXCLUDED.is_active,
+        processing_date = CURRENT_TIMESTAMP;
+    """
+
+PRODUCT_ANALYTICS_QUERY = """
+    CREATE TEMP TABLE stg_product_analytics ON COMMIT DROP AS
+    WITH affected_products AS (
+        SELECT product_id FROM raw_data.products
+        WHERE %(since)s IS NULL OR extraction_timestamp >= %(since)s
+        UNION
+        SELECT product_id FROM raw_data.sales
+        WHERE extraction_timestamp >= %(since)s
+    ),
+    product_top_locations AS (
+        SELECT
+            product_id,
+            ARRAY_AGG(store_location ORDER BY rn) as top_locations
+        FROM (
+            SELECT
+                product_id,
+                store_location,
+                ROW_NUMBER() OVER (PARTITION BY product_id ORDER BY COUNT(*) DESC, store_location) as rn
+            FROM raw_data.sales
+            WHERE product_id IN (SELECT product_id FROM affected_products)
+            GROUP BY product_id, store_location
+        ) ranked_locations
+        WHERE rn <= 5
+        GROUP BY product_id
+    )
+    SELECT 
+        p.product_id,
+        p.name,
+        p.category,
+        p.brand,
+        COUNT(s.sale_id) as total_sales,
+        COALESCE(SUM(s.total_amount), 0) as total_revenue,
+        AVG(p.price) as avg_price,
+        COUNT(DISTINCT s.user_id) as unique_customers,
+        tl.top_locations
+    FROM raw_data.products p
+    LEFT JOIN raw_data.sales s ON p.product_id = s.product_id
+    LEFT JOIN product_top_locations tl ON tl.product_id = p.product_id
+    WHERE p.product_id IN (SELECT product_id FROM affected_products)
+    GROUP BY p.product_id, p.name, p.category, p.brand, p.price, tl.top_locations;
+    
+    INSERT INTO processed_data.product_analytics (
+        product_id, name, category, brand, total_sales, total_revenue,
+        avg_price, unique_customers, top_locations
+    )
+    SELECT * FROM stg_product_analytics
+    ON CONFLICT (product_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        category = EXCLUDED.category,
+        brand = EXCLUDED.brand,
+        total_sales = EXCLUDED.total_sales,
+        total_revenue = EXCLUDED.total_revenue,
+        avg_price = EXCLUDED.avg_price,
+        unique_customers = EXCLUDED.unique_customers,
+        top_locations = EXCLUDED.top_locations,
+        processing_date = CURRENT_TIMESTAMP;
+    """
+
+SALES_ANALYTICS_QUERY = """
+    CREATE TEMP TABLE stg_sales_analytics ON COMMIT DROP AS
+    WITH affected_dates AS (
+        SELECT DISTINCT sale_date FROM raw_data.sales
+        WHERE %(since)s IS NULL OR extraction_timestamp >= %(since)s
+    ),
+    daily_category_counts AS (
+        SELECT
+            s.sale_date,
+            p.category,
+            ROW_NUMBER() OVER (PARTITION BY s.sale_date ORDER BY COUNT(*) DESC, p.category) as rn
+        FROM raw_data.sales s
+        JOIN raw_data.products p ON s.product_id = p.product_id
+        WHERE s.sale_date IN (SELECT sale_date FROM affected_dates)
+        GROUP BY s.sale_date, p.category
+    ),
+    daily_location_counts AS (
+        SELECT
+            sale_date,
+            store_location,
+            ROW_NUMBER() OVER (PARTITION BY sale_date ORDER BY COUNT(*) DESC, store_location) as rn
+        FROM raw_data.sales
+        WHERE sale_date IN (SELECT sale_date FROM affected_dates)
+        GROUP BY sale_date, store_location
+    )
+    SELECT 
+        s.sale_date as date,
+        COUNT(s.sale_id) as total_sales,
+        SUM(s.total_amount) as total_revenue,
+        AVG(s.total_amount) as avg_order_value,
+        COUNT(DISTINCT s.user_id) as unique_customers,
+        COUNT(DISTINCT s.product_id) as unique_products,
+        tc.category as top_category,
+        tl.store_location as top_location
+    FROM raw_data.sales s
+    LEFT JOIN daily_category_counts tc ON tc.sale_date = s.sale_date AND tc.rn = 1
+    LEFT JOIN daily_location_counts tl ON tl.sale_date = s.sale_date AND tl.rn = 1
+    WHERE s.sale_date IN (SELECT sale_date FROM affected_dates)
+    GROUP BY s.sale_date, tc.category, tl.store_location;
+    
+    INSERT INTO processed_data.sales_analytics (
+        date, total_sales, total_revenue, avg_order_value,
+        unique_customers, unique_products, top_category, top_location
+    )
+    SELECT * FROM stg_sales_analytics
+    ON CONFLICT (date) DO UPDATE SET
+        total_sales = EXCLUDED.total_sales,
+        total_revenue = EXCLUDED.total_revenue,
+        avg_order_value = EXCLUDED.avg_order_value,
+        unique_customers = EXCLUDED.unique_customers,
+        unique_products = EXCLUDED.unique_products,
+        top_category = EXCLUDED.top_category,
+        top_location = EXCLUDED.top_location,
+        processing_date = CURRENT_TIMESTAMP;
+    """
+
+def _analytics_params(context):
+    """Only rows loaded since the last successful run need re-aggregating; None means everything"""
+    return {'since': context.get('prev_start_date_success')}
+
+def _run_analytics_query(name, query, params=None):
+    """Run one analytics upsert in its own transaction"""
+    conn = None
+    
+    try:
+        postgres_hook = PostgresHook(postgres_conn_id='postgres_default')
+        conn = postgres_hook.get_conn()
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+        conn.commit()
         
-        return "Analytics pipeline completed successfully"
+        return f"{name} analytics completed successfully"
         
     except Exception as e:
-        raise Exception(f"Analytics pipeline failed: {str(e)}")
+        raise Exception(f"{name} analytics failed: {str(e)}")
+    
+    finally:
+        if conn is not None:
+            conn.close()
+
+def run_user_analytics(**context):
+    """Refresh processed_data.user_analytics"""
+    return _run_analytics_query("User", USER_ANALYTICS_QUERY)
+
+def run_product_analytics(**context):
+    """Refresh processed_data.product_analytics"""
+    return _run_analytics_query("Product", PRODUCT_ANALYTICS_QUERY, _analytics_params(context))
+
+def run_sales_analytics(**context):
+    """Refresh processed_data.sales_analytics"""
+    return _run_analytics_query("Sales", SALES_ANALYTICS_QUERY, _analytics_params(context))
 
 def data_quality_check(**context):
     """Run data quality checks"""
@@ -292,30 +393,45 @@ def data_quality_check(**context):
         }
     ]
     
-    failed_checks = []
-    
-    for check in quality_checks:
-        result = postgres_hook.get_first(check['check'])[0]
-        status = 'pass' if result >= check['threshold'] else 'fail'
+    # Read the checks and write their metrics over one connection
+    conn = postgres_hook.get_conn()
+    try:
+        cursor = conn.cursor()
+        
+        # Run every check as a scalar subquery of one SELECT, so all of them cost a single round-trip
+        combined_query = "SELECT " + ", ".join(f"({check['check']})" for check in quality_checks)
+        cursor.execute(combined_query)
+        results = cursor.fetchone()
+        
+        failed_checks = []
+        metric_rows = []
         
-        if status == 'fail':
-            failed_checks.append(f"{check['metric_name']}: {result} (threshold: {check['threshold']})")
+        for check, result in zip(quality_checks, results):
+            status = 'pass' if result >= check['threshold'] else 'fail'
+            
+            if status == 'fail':
+                failed_checks.append(f"{check['metric_name']}: {result} (threshold: {check['threshold']})")
+            
+            metric_rows.append((
+                check['table'],
+                check['metric_name'],
+                float(result),
+                float(check['threshold']),
+                status,
+                Json({'check_query': check['check']})
+            ))
         
-        # Log the metric
+        # Log all metrics in a single multi-row INSERT
         metric_query = """
         INSERT INTO analytics.data_quality_metrics 
         (table_name, metric_name, metric_value, threshold_value, status, details)
-        VALUES (%s, %s, %s, %s, %s, %s)
+        VALUES %s
         """
         
-        postgres_hook.run(metric_query, parameters=[
-            check['table'],
-            check['metric_name'],
-            float(result),
-            float(check['threshold']),
-            status,
-            {'check_query': check['check']}
-        ])
+        execute_values(cursor, metric_query, metric_rows, page_size=len(metric_rows))
+        conn.commit()
+    finally:
+        conn.close()
     
     if failed_checks:
         raise Exception(f"Data quality checks failed: {'; '.join(failed_checks)}")
@@ -340,29 +456,55 @@ init_database = PostgresOperator(
     dag=dag,
 )
 
-# ETL tasks
+# ETL tasks (the etl_cpu pool lets the three ingests run side by side)
 users_etl = PythonOperator(
     task_id='users_etl',
     python_callable=run_etl_job,
+    pool='etl_cpu',
     dag=dag,
 )
 
 products_etl = PythonOperator(
     task_id='products_etl',
     python_callable=run_etl_job,
+    pool='etl_cpu',
     dag=dag,
 )
 
 sales_etl = PythonOperator(
     task_id='sales_etl',
     python_callable=run_etl_job,
+    pool='etl_cpu',
+    dag=dag,
+)
+
+# Skip the analytics upserts when none of the ETL tasks loaded anything new
+analytics_gate = ShortCircuitOperator(
+    task_id='analytics_gate',
+    python_callable=has_new_rows,
+    ignore_downstream_trigger_rules=False,
+    dag=dag,
+)
+
+# Analytics tasks (independent upserts that can run side by side)
+user_analytics = PythonOperator(
+    task_id='user_analytics',
+    python_callable=run_user_analytics,
+    pool='analytics_db',
+    dag=dag,
+)
+
+product_analytics = PythonOperator(
+    task_id='product_analytics',
+    python_callable=run_product_analytics,
+    pool='analytics_db',
     dag=dag,
 )
 
-# Analytics task
-analytics_pipeline = PythonOperator(
-    task_id='analytics_pipeline',
-    python_callable=run_analytics_pipeline,
+sales_analytics = PythonOperator(
+    task_id='sales_analytics',
+    python_callable=run_sales_analytics,
+    pool='analytics_db',
     dag=dag,
 )
 
@@ -370,6 +512,7 @@ analytics_pipeline = PythonOperator(
 data_quality = PythonOperator(
     task_id='data_quality_check',
     python_callable=data_quality_check,
+    trigger_rule='none_failed',
     dag=dag,
 )
 
@@ -381,7 +524,10 @@ cleanup = BashOperator(
 )
 
 # Define task dependencies
-init_database >> [users_etl, products_etl, sales_etl]
-[users_etl, products_etl, sales_etl] >> analytics_pipeline
-analytics_pipeline >> data_quality
+# raw_data.sales references users and products by foreign key, so sales load after them
+init_database >> [users_etl, products_etl]
+[users_etl, products_etl] >> sales_etl
+[users_etl, products_etl, sales_etl] >> analytics_gate
+analytics_gate >> [user_analytics, product_analytics, sales_analytics]
+[user_analytics, product_analytics, sales_analytics] >> data_quality
 data_quality >> cleanup
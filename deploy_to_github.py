@@ -4,11 +4,12 @@ GitHub Pages Deployment
 Deploys dashboard to GitHub Pages for professional URL
 """
 
+import argparse
 import subprocess
 import webbrowser
 from pathlib import Path
 
-def create_github_repo():
+def create_github_repo(open_browser=True):
     """Create GitHub repository and deploy"""
     dashboard_path = Path.home() / "Desktop" / "Cloud_Dashboard"
     
@@ -61,11 +62,12 @@ def create_github_repo():
     print()
     
     # Open GitHub in browser
-    try:
-        webbrowser.open("https://github.com/new")
-        print("🌐 GitHub opened in your browser!")
-    except:
-        print("💡 Open manually: https://github.com/new")
+    if open_browser:
+        try:
+            webbrowser.open("https://github.com/new")
+            print("🌐 GitHub opened in your browser!")
+        except:
+            print("💡 Open manually: https://github.com/new")
     
     return True
 
@@ -119,16 +121,22 @@ https://[your-username].github.io/data-pipeline-dashboard/
 """
     
     guide_path = Path.home() / "Desktop" / "Cloud_Dashboard" / "DEPLOYMENT_GUIDE.md"
+    
+    # Leave an identical guide alone instead of rewriting it on every run
+    if guide_path.exists() and guide_path.read_text() == guide_content:
+        print(f"📋 Deployment guide up to date: {guide_path}")
+        return guide_path
+    
     with open(guide_path, 'w') as f:
         f.write(guide_content)
     
     print(f"📋 Deployment guide created: {guide_path}")
     return guide_path
 
-def main():
+def main(open_browser=True):
     """Main deployment function"""
     # Create deployment guide
-    create_github_repo()
+    create_github_repo(open_browser)
     create_deployment_guide()
     
     print("\n✅ Ready for GitHub Pages deployment!")
@@ -136,4 +144,8 @@ def main():
     print("📋 Follow the steps above for instant deployment")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Prepare the dashboard for GitHub Pages")
+    parser.add_argument('--no-browser', action='store_true', help="don't open GitHub in a browser")
+    args = parser.parse_args()
+    
+    main(open_browser=not args.no_browser)
@@ -5,42 +5,45 @@ Deploys dashboard to Netlify for instant public URL
 """
 
 import os
+import argparse
+import shutil
 import subprocess
 import webbrowser
 from pathlib import Path
 
+def netlify_cli_available():
+    """Check whether the Netlify CLI is on PATH, without spawning it"""
+    return shutil.which('netlify') is not None
+
 def deploy_with_netlify_cli():
     """Deploy using Netlify CLI (if available)"""
-    try:
-        # Check if netlify CLI is installed
-        result = subprocess.run(['netlify', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("🚀 Netlify CLI found, deploying...")
-            
-            # Navigate to dashboard directory
-            dashboard_path = Path.home() / "Desktop" / "Cloud_Dashboard"
-            os.chdir(dashboard_path)
-            
-            # Deploy to Netlify
-            result = subprocess.run(['netlify', 'deploy', '--prod', '--dir', '.'], 
-                               capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                # Extract URL from output
-                output = result.stdout
-                for line in output.split('\n'):
-                    if 'Website URL:' in line:
-                        url = line.split('Website URL:')[1].strip()
-                        print(f"✅ Dashboard deployed successfully!")
-                        print(f"🌐 Public URL: {url}")
-                        return url
-            
-            print("❌ Netlify deployment failed")
-            print(f"Error: {result.stderr}")
-            
-    except FileNotFoundError:
+    if not netlify_cli_available():
         print("📦 Netlify CLI not found")
         return None
+    
+    print("🚀 Netlify CLI found, deploying...")
+    
+    # Navigate to dashboard directory
+    dashboard_path = Path.home() / "Desktop" / "Cloud_Dashboard"
+    os.chdir(dashboard_path)
+    
+    # Deploy to Netlify
+    result = subprocess.run(['netlify', 'deploy', '--prod', '--dir', '.'], 
+                       capture_output=True, text=True)
+    
+    if result.returncode == 0:
+        # Extract URL from output
+        output = result.stdout
+        for line in output.split('\n'):
+            if 'Website URL:' in line:
+                url = line.split('Website URL:')[1].strip()
+                print(f"✅ Dashboard deployed successfully!")
+                print(f"🌐 Public URL: {url}")
+                return url
+    
+    print("❌ Netlify deployment failed")
+    print(f"Error: {result.stderr}")
+    return None
 
 def deploy_manual_instructions():
     """Provide manual deployment instructions"""
@@ -96,13 +99,18 @@ pwd
 '''
     
     script_path = Path.home() / "Desktop" / "Cloud_Dashboard" / "deploy.sh"
+    
+    # Leave an identical script alone instead of rewriting and chmod-ing it on every run
+    if script_path.exists() and script_path.read_text() == script_content:
+        return script_path
+    
     with open(script_path, 'w') as f:
         f.write(script_content)
     
     os.chmod(script_path, 0o755)
     return script_path
 
-def main():
+def main(open_browser=True):
     """Main deployment function"""
     print("🌐 One-Click Cloud Deployment")
     print("=" * 40)
@@ -118,11 +126,12 @@ def main():
         deploy_manual_instructions()
         
         # Open Netlify drop
-        try:
-            webbrowser.open("https://app.netlify.com/drop")
-            print("🌐 Netlify Drop opened in your browser!")
-        except:
-            print("💡 Open manually: https://app.netlify.com/drop")
+        if open_browser:
+            try:
+                webbrowser.open("https://app.netlify.com/drop")
+                print("🌐 Netlify Drop opened in your browser!")
+            except:
+                print("💡 Open manually: https://app.netlify.com/drop")
         
         print(f"\n📋 Quick script created: {script_path}")
         print("💡 Run it to navigate to dashboard folder and open Netlify")
@@ -130,6 +139,10 @@ def main():
     return url is not None
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="Deploy the dashboard to Netlify")
+    parser.add_argument('--no-browser', action='store_true', help="don't open Netlify Drop in a browser")
+    args = parser.parse_args()
+    
+    success = main(open_browser=not args.no_browser)
     if not success:
         print("\n🎯 Manual deployment required - see instructions above!")
@@ -6,6 +6,7 @@ Quick Demo - Shows the complete pipeline working without database
 import sys
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to Python path
 project_root = Path(__file__).parent
@@ -21,9 +22,9 @@ def main():
         from src.extract.csv_extractor import CSVExtractor
         extractor = CSVExtractor()
         
-        users_df = extractor.extract_from_csv('data/raw/sample_users.csv')
-        products_df = extractor.extract_from_csv('data/raw/sample_products.csv')
-        sales_df = extractor.extract_from_csv('data/raw/sample_sales.csv')
+        users_df = extractor.extract_from_csv_arrow('data/raw/sample_users.csv')
+        products_df = extractor.extract_from_csv_arrow('data/raw/sample_products.csv')
+        sales_df = extractor.extract_from_csv_arrow('data/raw/sample_sales.csv')
         
         print(f"✅ Users: {len(users_df)} rows")
         print(f"✅ Products: {len(products_df)} rows")
@@ -39,16 +40,18 @@ def main():
         from src.transform.data_transformer import DataTransformer
         transformer = DataTransformer()
         
-        users_clean = transformer.clean_data(users_df)
-        users_std = transformer.standardize_columns(users_clean)
-        print(f"✅ Users transformed: {len(users_clean)} rows")
+        def clean_and_standardize(df):
+            cleaned = transformer.clean_data(df)
+            return cleaned, transformer.standardize_columns(cleaned)
         
-        products_clean = transformer.clean_data(products_df)
-        products_std = transformer.standardize_columns(products_clean)
-        print(f"✅ Products transformed: {len(products_clean)} rows")
+        # The three tables are independent, so transform them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            (users_clean, users_std), (products_clean, products_std), (sales_clean, sales_std) = executor.map(
+                clean_and_standardize, (users_df, products_df, sales_df)
+            )
         
-        sales_clean = transformer.clean_data(sales_df)
-        sales_std = transformer.standardize_columns(sales_clean)
+        print(f"✅ Users transformed: {len(users_clean)} rows")
+        print(f"✅ Products transformed: {len(products_clean)} rows")
         print(f"✅ Sales transformed: {len(sales_clean)} rows")
         
     except Exception as e:
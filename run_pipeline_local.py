@@ -6,6 +6,7 @@ Run the complete data engineering pipeline locally
 
 import sys
 import os
+import argparse
 import subprocess
 from pathlib import Path
 
@@ -13,6 +14,9 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# Touched after a successful dependency install; requirements.txt changes after that trigger a reinstall
+DEPS_SENTINEL = Path('.deps_installed')
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 8):
@@ -26,12 +30,17 @@ def install_dependencies():
     print("📦 Installing Python dependencies...")
     try:
         subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        DEPS_SENTINEL.touch()
         print("✅ Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install dependencies: {e}")
         return False
 
+def dependencies_outdated():
+    """Check whether requirements.txt has changed since the last successful install"""
+    return not DEPS_SENTINEL.exists() or DEPS_SENTINEL.stat().st_mtime < os.path.getmtime('requirements.txt')
+
 def setup_postgres():
     """Setup PostgreSQL locally or provide instructions"""
     print("🗄️  PostgreSQL Setup Required")
@@ -94,7 +103,8 @@ def run_pipeline():
                         'total_amount': {'min': 0}
                     }
                 },
-                'load_strategy': 'replace'
+                'load_strategy': 'replace',
+                'dependencies': ['users_etl', 'products_etl']
             }
         }
         
@@ -119,7 +129,7 @@ def run_pipeline():
         print(f"❌ Pipeline failed: {str(e)}")
         return False
 
-def main():
+def main(install=False):
     """Main execution function"""
     print("🚀 Data Engineering Pipeline - Local Setup")
     print("=" * 50)
@@ -128,8 +138,8 @@ def main():
     if not check_python_version():
         return False
     
-    # Install dependencies
-    if not install_dependencies():
+    # Install dependencies (skipped while the last install is still current)
+    if (install or dependencies_outdated()) and not install_dependencies():
         return False
     
     # Setup PostgreSQL instructions
@@ -148,7 +158,11 @@ def main():
     return run_pipeline()
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="Run the data engineering pipeline locally")
+    parser.add_argument('--install', action='store_true', help="reinstall requirements.txt even if already installed")
+    args = parser.parse_args()
+    
+    success = main(install=args.install)
     if success:
         print("\n🎉 Pipeline completed successfully!")
     else:
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Fetch Chart.js for the cloud dashboard
+Downloads the pinned Chart.js build, checks its SHA-256 and saves it where
+cloud_dashboard.py inlines it from
+"""
+
+import sys
+import argparse
+import hashlib
+import urllib.request
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from cloud_dashboard import CHART_JS_URL, CHART_JS_FILE, CHART_JS_SHA256
+
+def fetch_chart_js(expected_sha256):
+    """Download CHART_JS_URL and write it to CHART_JS_FILE if its checksum matches"""
+    print(f"📥 Downloading {CHART_JS_URL}")
+    try:
+        with urllib.request.urlopen(CHART_JS_URL, timeout=30) as response:
+            content = response.read()
+    except OSError as e:
+        print(f"❌ Download failed: {e}")
+        return False
+    
+    digest = hashlib.sha256(content).hexdigest()
+    
+    if expected_sha256 is None:
+        print(f"❌ No checksum to verify against; downloaded file has SHA-256 {digest}")
+        print("   Check it against the hash jsDelivr publishes for the file, then rerun with --sha256")
+        return False
+    
+    if digest != expected_sha256.lower():
+        print(f"❌ Checksum mismatch: expected {expected_sha256}, got {digest}")
+        return False
+    
+    CHART_JS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    CHART_JS_FILE.write_bytes(content)
+    print(f"✅ Saved {CHART_JS_FILE.relative_to(project_root)} (SHA-256 {digest})")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch the pinned Chart.js build for the cloud dashboard")
+    parser.add_argument('--sha256', default=CHART_JS_SHA256,
+                        help="expected hex SHA-256 of the file (defaults to CHART_JS_SHA256)")
+    args = parser.parse_args()
+    
+    if not fetch_chart_js(args.sha256):
+        sys.exit(1)
@@ -30,6 +30,17 @@ CREATE TABLE IF NOT EXISTS raw_data.users (
     extraction_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Age bucket used by the user analytics, computed once when a row is written
+ALTER TABLE raw_data.users ADD COLUMN IF NOT EXISTS age_group VARCHAR(20) GENERATED ALWAYS AS (
+    CASE 
+        WHEN age < 25 THEN '18-24'
+        WHEN age < 35 THEN '25-34'
+        WHEN age < 45 THEN '35-44'
+        WHEN age < 55 THEN '45-54'
+        ELSE '55+'
+    END
+) STORED;
+
 -- Create products table
 CREATE TABLE IF NOT EXISTS raw_data.products (
     id SERIAL PRIMARY KEY,
@@ -149,11 +160,13 @@ CREATE INDEX IF NOT EXISTS idx_products_created_date ON raw_data.products(create
 CREATE INDEX IF NOT EXISTS idx_sales_user_id ON raw_data.sales(user_id);
 CREATE INDEX IF NOT EXISTS idx_sales_product_id ON raw_data.sales(product_id);
 CREATE INDEX IF NOT EXISTS idx_sales_date ON raw_data.sales(sale_date);
+CREATE INDEX IF NOT EXISTS idx_sales_extraction_timestamp ON raw_data.sales(extraction_timestamp);
 CREATE INDEX IF NOT EXISTS idx_sales_store_location ON raw_data.sales(store_location);
+CREATE INDEX IF NOT EXISTS idx_sales_invalid_amount ON raw_data.sales(sale_id) WHERE total_amount IS NULL OR total_amount <= 0;
 
 CREATE INDEX IF NOT EXISTS idx_user_analytics_user_id ON processed_data.user_analytics(user_id);
 CREATE INDEX IF NOT EXISTS idx_product_analytics_product_id ON processed_data.product_analytics(product_id);
-CREATE INDEX IF NOT EXISTS idx_sales_analytics_date ON processed_data.sales_analytics(date);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_sales_analytics_date_unique ON processed_data.sales_analytics(date);
 
 CREATE INDEX IF NOT EXISTS idx_etl_logs_job_name ON analytics.etl_job_logs(job_name);
 CREATE INDEX IF NOT EXISTS idx_etl_logs_start_time ON analytics.etl_job_logs(start_time);
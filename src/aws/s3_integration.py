@@ -1,56 +1,168 @@
 import boto3
 import pandas as pd
+import pyarrow as pa
+import pyarrow.fs as pa_fs
+import pyarrow.parquet as pq
 import logging
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
+import io
 import json
+from functools import lru_cache
+from collections import OrderedDict
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
+# Module logger, configured once at import and shared by every instance
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+
+@lru_cache(maxsize=None)
+def _get_s3_client(aws_access_key_id: str, aws_secret_access_key: str, aws_region: str):
+    # boto3 clients are thread-safe and slow to build, so one client is shared by every
+    # S3Integration created with the same credentials. A larger keep-alive connection pool
+    # lets concurrent transfers and bulk copy/delete calls reuse connections instead of
+    # opening a new TLS session per request
+    client_config = Config(
+        max_pool_connections=64,
+        retries={'max_attempts': 10, 'mode': 'adaptive'},
+        tcp_keepalive=True
+    )
+    
+    return boto3.client(
+        's3',
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        region_name=aws_region,
+        config=client_config
+    )
+
+class S3MultipartWriter:
+    # Write-only file object that streams to S3: bytes are buffered until a part's worth has
+    # accumulated and then sent with upload_part, so encoding overlaps with the upload and
+    # memory is bounded by part_size. Bodies smaller than one part go up with a single put_object.
+    def __init__(self, s3_client, bucket: str, key: str, part_size: int = 8 * 1024 * 1024):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.parts = []
+        self.position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        self.buffer += data
+        self.position += len(data)
+        
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+        
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def flush(self):
+        pass
+    
+    def _upload_part(self, body: bytes):
+        if self.upload_id is None:
+            self.upload_id = self.s3_client.create_multipart_upload(Bucket=self.bucket, Key=self.key)['UploadId']
+        
+        part_number = len(self.parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            PartNumber=part_number, Body=body
+        )
+        self.parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+    
+    def close(self):
+        if self.closed:
+            return
+        
+        self.closed = True
+        
+        if self.upload_id is None:
+            self.s3_client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self.buffer))
+        else:
+            if self.buffer:
+                self._upload_part(bytes(self.buffer))
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+                MultipartUpload={'Parts': self.parts}
+            )
+        
+        self.buffer = bytearray()
+    
+    def abort(self):
+        self.closed = True
+        
+        if self.upload_id is not None:
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
 class S3Integration:
     def __init__(self, aws_access_key_id: str, aws_secret_access_key: str, 
-                 aws_region: str = 'us-east-1', bucket_name: str = None):
+                 aws_region: str = 'us-east-1', bucket_name: str = None, s3_client=None,
+                 verify_on_init: bool = False, object_cache_size: int = 0):
         self.aws_access_key_id = aws_access_key_id
         self.aws_secret_access_key = aws_secret_access_key
         self.aws_region = aws_region
         self.bucket_name = bucket_name
         
-        self.logger = self._setup_logger()
-        self.s3_client = None
-        self.s3_resource = None
+        self.logger = logger
+        self.s3_client = s3_client
+        # An injected client may point at another endpoint or carry its own credentials,
+        # which Arrow's S3 filesystem cannot pick up, so Parquet reads then go through it
+        self.client_injected = s3_client is not None
+        self.transfer_config = None
+        self.arrow_fs = None
+        # Opt-in LRU of parsed DataFrames for read_s3_to_dataframe, bounded by entry count
+        self.object_cache_size = object_cache_size
+        self.object_cache = OrderedDict()
+        self.verify_on_init = verify_on_init
         
         self._initialize_s3()
     
-    def _setup_logger(self):
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
-        return logger
-    
     def _initialize_s3(self):
         try:
-            self.s3_client = boto3.client(
-                's3',
-                aws_access_key_id=self.aws_access_key_id,
-                aws_secret_access_key=self.aws_secret_access_key,
-                region_name=self.aws_region
+            # Callers may pass in a client of their own; otherwise use the shared one for these credentials
+            if self.s3_client is None:
+                self.s3_client = _get_s3_client(self.aws_access_key_id, self.aws_secret_access_key, self.aws_region)
+            
+            # Objects over 8 MB are transferred as concurrent 8 MB multipart parts / byte ranges
+            self.transfer_config = TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=8 * 1024 * 1024,
+                max_concurrency=16,
+                use_threads=True
             )
             
-            self.s3_resource = boto3.resource(
-                's3',
-                aws_access_key_id=self.aws_access_key_id,
-                aws_secret_access_key=self.aws_secret_access_key,
-                region_name=self.aws_region
-            )
+            # Probing with list_buckets costs a round trip per instance, so it is opt-in;
+            # otherwise bad credentials surface on the first real request
+            if self.verify_on_init:
+                self.s3_client.list_buckets()
             
-            # Test connection
-            self.s3_client.list_buckets()
             self.logger.info("✅ S3 connection initialized successfully")
             
         except NoCredentialsError:
@@ -60,6 +172,18 @@ class S3Integration:
             self.logger.error(f"❌ Failed to initialize S3: {str(e)}")
             raise
     
+    def _get_arrow_fs(self) -> pa_fs.S3FileSystem:
+        # Arrow's S3 filesystem issues range GETs, so Parquet reads can skip unneeded columns/row
+        # groups; it is only built on the first such read rather than for every instance
+        if self.arrow_fs is None:
+            self.arrow_fs = pa_fs.S3FileSystem(
+                access_key=self.aws_access_key_id,
+                secret_key=self.aws_secret_access_key,
+                region=self.aws_region
+            )
+        
+        return self.arrow_fs
+    
     def create_bucket(self, bucket_name: str = None) -> bool:
         try:
             bucket = bucket_name or self.bucket_name
@@ -94,8 +218,9 @@ class S3Integration:
     
     def upload_dataframe_to_s3(self, df: pd.DataFrame, key: str, 
                               bucket_name: str = None, 
-                              file_format: str = 'csv',
-                              index: bool = False) -> bool:
+                              file_format: str = 'parquet',
+                              index: bool = False,
+                              row_group_size: int = 500_000) -> bool:
         try:
             bucket = bucket_name or self.bucket_name
             
@@ -103,27 +228,39 @@ class S3Integration:
                 raise ValueError("Bucket name is required")
             
             # Convert DataFrame to appropriate format
-            if file_format.lower() == 'csv':
-                csv_buffer = df.to_csv(index=index)
-                self.s3_client.put_object(
-                    Bucket=bucket,
-                    Key=key,
-                    Body=csv_buffer
-                )
+            if file_format.lower() == 'parquet':
+                # Encode one row group at a time straight into a multipart upload, so the full
+                # Parquet file is never held in memory and parts go out while later ones encode
+                # The schema comes from the first real chunk: an empty slice gives object columns the
+                # null type, which every string value then fails to convert to. Columns that are
+                # entirely missing in that chunk take their type from the first values after it.
+                schema = pa.Table.from_pandas(df.iloc[:row_group_size], preserve_index=index).schema
+                
+                for i, field in enumerate(schema):
+                    if pa.types.is_null(field.type) and field.name in df.columns:
+                        values = df[field.name].dropna()
+                        
+                        if len(values):
+                            inferred = pa.Array.from_pandas(values.iloc[:row_group_size]).type
+                            schema = schema.set(i, field.with_type(inferred))
+                
+                with S3MultipartWriter(self.s3_client, bucket, key) as sink:
+                    with pq.ParquetWriter(sink, schema, compression='snappy') as writer:
+                        for start in range(0, len(df), row_group_size):
+                            chunk = df.iloc[start:start + row_group_size]
+                            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=index))
             elif file_format.lower() == 'json':
-                json_buffer = df.to_json(orient='records', lines=True)
-                self.s3_client.put_object(
-                    Bucket=bucket,
-                    Key=key,
-                    Body=json_buffer
-                )
-            elif file_format.lower() == 'parquet':
-                parquet_buffer = df.to_parquet(index=index)
-                self.s3_client.put_object(
-                    Bucket=bucket,
-                    Key=key,
-                    Body=parquet_buffer
-                )
+                # Serialise row_group_size rows at a time into the multipart upload instead of
+                # building the whole JSON Lines document as one string first
+                with S3MultipartWriter(self.s3_client, bucket, key) as sink:
+                    for start in range(0, len(df), row_group_size):
+                        chunk = df.iloc[start:start + row_group_size].to_json(orient='records', lines=True)
+                        sink.write(chunk.rstrip('\n').encode('utf-8') + b'\n')
+            elif file_format.lower() == 'csv':
+                body = df.to_csv(index=index).encode('utf-8')
+                
+                # upload_fileobj switches to a parallel multipart upload for large bodies
+                self.s3_client.upload_fileobj(io.BytesIO(body), bucket, key, Config=self.transfer_config)
             else:
                 raise ValueError(f"Unsupported file format: {file_format}")
             
@@ -145,7 +282,7 @@ class S3Integration:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"File not found: {file_path}")
             
-            self.s3_client.upload_file(file_path, bucket, key)
+            self.s3_client.upload_file(file_path, bucket, key, Config=self.transfer_config)
             
             self.logger.info(f"✅ File uploaded to s3://{bucket}/{key}")
             return True
@@ -165,7 +302,7 @@ class S3Integration:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
-            self.s3_client.download_file(bucket, key, file_path)
+            self.s3_client.download_file(bucket, key, file_path, Config=self.transfer_config)
             
             self.logger.info(f"✅ File downloaded from s3://{bucket}/{key} to {file_path}")
             return True
@@ -175,26 +312,59 @@ class S3Integration:
             return False
     
     def read_s3_to_dataframe(self, key: str, bucket_name: str = None, 
-                           file_format: str = 'csv', **kwargs) -> pd.DataFrame:
+                           file_format: str = 'parquet', columns: List[str] = None,
+                           filters: List = None, **kwargs) -> pd.DataFrame:
         try:
             bucket = bucket_name or self.bucket_name
             
             if not bucket:
                 raise ValueError("Bucket name is required")
             
-            # Get object from S3
-            obj = self.s3_client.get_object(Bucket=bucket, Key=key)
-            body = obj['Body']
+            if file_format.lower() not in ('csv', 'json', 'parquet'):
+                raise ValueError(f"Unsupported file format: {file_format}")
             
-            # Read based on file format
-            if file_format.lower() == 'csv':
-                df = pd.read_csv(body, **kwargs)
-            elif file_format.lower() == 'json':
-                df = pd.read_json(body, lines=True, **kwargs)
-            elif file_format.lower() == 'parquet':
-                df = pd.read_parquet(body, **kwargs)
+            if filters is not None and file_format.lower() != 'parquet':
+                raise ValueError("Row filters are only supported for Parquet")
+            
+            # With the cache enabled, repeat reads of an unchanged object are served from memory:
+            # a HEAD request compares the ETag with the one cached alongside the parsed DataFrame
+            if self.object_cache_size:
+                cache_key = (bucket, key, file_format.lower(), repr(columns), repr(filters), repr(sorted(kwargs.items())))
+                etag = self.s3_client.head_object(Bucket=bucket, Key=key)['ETag']
+                cached = self.object_cache.get(cache_key)
+                
+                if cached is not None and cached[0] == etag:
+                    self.object_cache.move_to_end(cache_key)
+                    self.logger.info(f"✅ DataFrame for s3://{bucket}/{key} unchanged, using cached copy")
+                    return cached[1].copy()
+            
+            if file_format.lower() == 'parquet' and not self.client_injected:
+                # Read straight from S3 so only the footer and the column chunks / row groups
+                # that survive columns= and filters= are fetched, instead of the whole object
+                df = pd.read_parquet(f"{bucket}/{key}", engine='pyarrow', filesystem=self._get_arrow_fs(),
+                                     columns=columns, filters=filters, **kwargs)
             else:
-                raise ValueError(f"Unsupported file format: {file_format}")
+                # Get object from S3 (download_fileobj fetches large objects as parallel byte ranges)
+                body = io.BytesIO()
+                self.s3_client.download_fileobj(bucket, key, body, Config=self.transfer_config)
+                body.seek(0)
+                
+                # Read based on file format
+                if file_format.lower() == 'parquet':
+                    df = pd.read_parquet(body, engine='pyarrow', columns=columns, filters=filters, **kwargs)
+                elif file_format.lower() == 'csv':
+                    df = pd.read_csv(body, usecols=columns, **kwargs)
+                else:
+                    df = pd.read_json(body, lines=True, **kwargs)
+                    if columns is not None:
+                        df = df[columns]
+            
+            if self.object_cache_size:
+                self.object_cache[cache_key] = (etag, df.copy())
+                self.object_cache.move_to_end(cache_key)
+                
+                while len(self.object_cache) > self.object_cache_size:
+                    self.object_cache.popitem(last=False)
             
             self.logger.info(f"✅ DataFrame loaded from s3://{bucket}/{key}")
             return df
@@ -203,6 +373,15 @@ class S3Integration:
             self.logger.error(f"❌ Failed to read S3 to DataFrame: {str(e)}")
             raise
     
+    def _object_info(self, obj: Dict) -> Dict[str, Any]:
+        return {
+            'key': obj['Key'],
+            'size': obj['Size'],
+            'last_modified': obj['LastModified'],
+            'etag': obj['ETag'].strip('"'),
+            'storage_class': obj.get('StorageClass', 'STANDARD')
+        }
+    
     def list_s3_objects(self, prefix: str = '', bucket_name: str = None) -> List[Dict]:
         try:
             bucket = bucket_name or self.bucket_name
@@ -210,19 +389,28 @@ class S3Integration:
             if not bucket:
                 raise ValueError("Bucket name is required")
             
-            objects = []
             paginator = self.s3_client.get_paginator('list_objects_v2')
             
-            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        objects.append({
-                            'key': obj['Key'],
-                            'size': obj['Size'],
-                            'last_modified': obj['LastModified'],
-                            'etag': obj['ETag'].strip('"'),
-                            'storage_class': obj.get('StorageClass', 'STANDARD')
-                        })
+            # List the top level with a delimiter first: objects directly under the prefix come
+            # back here, and each "sub-directory" comes back as a common prefix
+            objects = []
+            sub_prefixes = []
+            
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter='/'):
+                objects.extend(self._object_info(obj) for obj in page.get('Contents', []))
+                sub_prefixes.extend(common['Prefix'] for common in page.get('CommonPrefixes', []))
+            
+            # Then page through each sub-prefix as its own listing stream, in parallel
+            def list_prefix(sub_prefix):
+                return [
+                    self._object_info(obj)
+                    for page in paginator.paginate(Bucket=bucket, Prefix=sub_prefix)
+                    for obj in page.get('Contents', [])
+                ]
+            
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                for prefix_objects in executor.map(list_prefix, sub_prefixes):
+                    objects.extend(prefix_objects)
             
             self.logger.info(f"✅ Found {len(objects)} objects in s3://{bucket}/{prefix}")
             return objects
@@ -298,8 +486,9 @@ class S3Integration:
             if not backup_date:
                 backup_date = datetime.now()
             
-            # Create backup key with date
-            backup_key = f"backups/{table_name}/{backup_date.strftime('%Y/%m/%d')}/{table_name}_{backup_date.strftime('%Y%m%d_%H%M%S')}.csv"
+            # Create backup key with date; the date path is sliced from the one formatted timestamp
+            stamp = backup_date.strftime('%Y%m%d_%H%M%S')
+            backup_key = f"backups/{table_name}/{stamp[:4]}/{stamp[4:6]}/{stamp[6:8]}/{table_name}_{stamp}.parquet"
             
             success = self.upload_dataframe_to_s3(data, backup_key)
             
@@ -315,23 +504,37 @@ class S3Integration:
     def archive_old_data(self, days_old: int = 30, source_prefix: str = 'data/raw/', 
                         archive_prefix: str = 'archive/') -> bool:
         try:
-            cutoff_date = datetime.now() - timedelta(days=days_old)
+            # S3 reports LastModified as an aware UTC datetime
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
             
             # List objects in source prefix
             objects = self.list_s3_objects(source_prefix)
-            
+            old_keys = [obj['key'] for obj in objects if obj['last_modified'] < cutoff_date]
+            
+            # Copy to archive. Each copy is an independent round-trip and the client is
+            # thread-safe, so fan them out over a thread pool
+            with ThreadPoolExecutor(max_workers=32) as executor:
+                futures = {
+                    executor.submit(self.copy_s3_object, key, key.replace(source_prefix, archive_prefix)): key
+                    for key in old_keys
+                }
+                copied_keys = [futures[future] for future in as_completed(futures) if future.result()]
+            
+            # Delete the originals that were copied, up to 1000 keys per request
             archived_count = 0
             
-            for obj in objects:
-                if obj['last_modified'] < cutoff_date:
-                    source_key = obj['key']
-                    archive_key = source_key.replace(source_prefix, archive_prefix)
-                    
-                    # Copy to archive
-                    if self.copy_s3_object(source_key, archive_key):
-                        # Delete original
-                        if self.delete_s3_object(source_key):
-                            archived_count += 1
+            for start in range(0, len(copied_keys), 1000):
+                batch = copied_keys[start:start + 1000]
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+                errors = response.get('Errors', [])
+                
+                for error in errors:
+                    self.logger.warning(f"Failed to delete archived object {error['Key']}: {error['Message']}")
+                
+                archived_count += len(batch) - len(errors)
             
             self.logger.info(f"✅ Archived {archived_count} objects older than {days_old} days")
             return True
@@ -363,17 +566,17 @@ if __name__ == "__main__":
         s3_integration.create_bucket()
         
         # Upload data
-        s3_integration.upload_dataframe_to_s3(sample_data, 'test/sample_data.csv')
+        s3_integration.upload_dataframe_to_s3(sample_data, 'test/sample_data.parquet')
         
         # List objects
         objects = s3_integration.list_s3_objects()
         print(f"Objects in bucket: {len(objects)}")
         
         # Download data
-        s3_integration.download_from_s3('test/sample_data.csv', 'data/downloaded_data.csv')
+        s3_integration.download_from_s3('test/sample_data.parquet', 'data/downloaded_data.parquet')
         
         # Read back to DataFrame
-        downloaded_df = s3_integration.read_s3_to_dataframe('test/sample_data.csv')
+        downloaded_df = s3_integration.read_s3_to_dataframe('test/sample_data.parquet')
         print(f"Downloaded DataFrame shape: {downloaded_df.shape}")
         
     except Exception as e:
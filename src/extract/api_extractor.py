@@ -1,43 +1,95 @@
 import requests
 import pandas as pd
+import numpy as np
 import logging
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import threading
 import json
 
+# Module logger, configured once at import and shared by every instance
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+
+# orjson parses large JSON bodies several times faster than the stdlib; used when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Most recently used responses kept for conditional GETs; older ones are evicted
+RESPONSE_CACHE_SIZE = 128
+
 class APIExtractor:
     def __init__(self, base_url: str, api_key: str = None):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.session = requests.Session()
-        self.logger = self._setup_logger()
+        self.logger = logger
+        self.response_cache = OrderedDict()
+        # Pages may be fetched from several threads at once
+        self.cache_lock = threading.Lock()
+        
+        # requests already asks for gzip/deflate bodies; also say we only want JSON back
+        self.session.headers.update({'Accept': 'application/json'})
         
         if api_key:
             self.session.headers.update({'Authorization': f'Bearer {api_key}'})
     
-    def _setup_logger(self):
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
-        return logger
-    
     def _make_request(self, endpoint: str, params: Dict = None, retries: int = 3) -> Dict:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        # Key on the URL requests will actually send, which also handles list-valued params
+        cache_key = requests.Request('GET', url, params=params).prepare().url
+        
+        with self.cache_lock:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self.response_cache.move_to_end(cache_key)
+        
+        # Send the validators from the last response so an unchanged resource comes back
+        # as an empty 304 and the cached payload is reused
+        headers = {}
+        if cached is not None:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
         
         for attempt in range(retries):
             try:
-                response = self.session.get(url, params=params, timeout=30)
+                response = self.session.get(url, params=params, headers=headers, timeout=30)
                 response.raise_for_status()
                 
+                if response.status_code == 304 and cached is not None:
+                    self.logger.info(f"Data at {url} not modified, using cached response")
+                    return cached['data']
+                
                 self.logger.info(f"Successfully fetched data from {url}")
-                return response.json()
+                
+                if orjson is not None:
+                    data = orjson.loads(response.content)
+                else:
+                    data = response.json()
+                
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag or last_modified:
+                    with self.cache_lock:
+                        self.response_cache[cache_key] = {'etag': etag, 'last_modified': last_modified, 'data': data}
+                        self.response_cache.move_to_end(cache_key)
+                        
+                        while len(self.response_cache) > RESPONSE_CACHE_SIZE:
+                            self.response_cache.popitem(last=False)
+                
+                return data
                 
             except requests.exceptions.RequestException as e:
                 self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
@@ -59,12 +111,15 @@ class APIExtractor:
             if isinstance(data, list):
                 df = pd.DataFrame(data)
             elif isinstance(data, dict):
-                df = pd.json_normalize(data)
+                # Only nested objects need json_normalize's flattening; a flat record is one row as-is
+                if any(isinstance(value, (dict, list)) for value in data.values()):
+                    df = pd.json_normalize(data)
+                else:
+                    df = pd.DataFrame.from_records([data])
             else:
                 raise ValueError(f"Unsupported data format: {type(data)}")
             
-            df['extraction_timestamp'] = datetime.now()
-            df['source_endpoint'] = endpoint
+            self._add_metadata(df, endpoint)
             
             self.logger.info(f"Successfully extracted {len(df)} records from API")
             return df
@@ -73,55 +128,90 @@ class APIExtractor:
             self.logger.error(f"Error extracting from API endpoint {endpoint}: {str(e)}")
             raise
     
+    def _add_metadata(self, df: pd.DataFrame, endpoint: str):
+        df['extraction_timestamp'] = datetime.now()
+        # The endpoint is the same on every row, so store it as a one-category Categorical
+        # (one byte per row) instead of a full column of repeated Python strings
+        df['source_endpoint'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[endpoint])
+    
+    def _fetch_page(self, endpoint: str, params: Dict, page_param: str, page: int):
+        current_params = params.copy()
+        current_params[page_param] = page
+        
+        response_data = self._make_request(endpoint, current_params)
+        
+        if isinstance(response_data, dict):
+            data = response_data.get('data', response_data.get('results', []))
+            pagination = response_data.get('pagination', response_data.get('meta', {}))
+        else:
+            data = response_data
+            pagination = {}
+        
+        return data, pagination
+    
     def extract_paginated_data(self, endpoint: str, params: Dict = None,
                               page_param: str = 'page', size_param: str = 'limit',
-                              max_pages: int = None) -> pd.DataFrame:
+                              max_pages: int = None, max_workers: int = 8) -> pd.DataFrame:
         all_data = []
+        pages_fetched = 0
         page = 1
+        total_pages = None
         
         if params is None:
             params = {}
         
-        while True:
-            if max_pages and page > max_pages:
-                break
-                
-            current_params = params.copy()
-            current_params[page_param] = page
-            
-            try:
-                response_data = self._make_request(endpoint, current_params)
-                
-                if isinstance(response_data, dict):
-                    data = response_data.get('data', response_data.get('results', []))
-                    pagination = response_data.get('pagination', response_data.get('meta', {}))
+        # Pages are requested concurrently: once the first page reports total_pages, all the
+        # remaining pages are fetched at once; otherwise pages are read ahead max_workers at a
+        # time. Results are consumed in page order, stopping at the first empty or failed page.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while not (max_pages and page > max_pages):
+                if total_pages:
+                    last_page = total_pages
                 else:
-                    data = response_data
-                    pagination = {}
+                    last_page = page + (max_workers if page > 1 else 1) - 1
                 
-                if not data:
-                    break
+                if max_pages:
+                    last_page = min(last_page, max_pages)
                 
-                all_data.extend(data)
+                pages = range(page, last_page + 1)
+                futures = [executor.submit(self._fetch_page, endpoint, params, page_param, p) for p in pages]
+                finished = False
                 
-                total_pages = pagination.get('total_pages')
-                if total_pages and page >= total_pages:
-                    break
+                for current_page, future in zip(pages, futures):
+                    try:
+                        data, pagination = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error fetching page {current_page}: {str(e)}")
+                        finished = True
+                        break
+                    
+                    if not data:
+                        finished = True
+                        break
+                    
+                    all_data.extend(data)
+                    pages_fetched += 1
+                    
+                    total_pages = total_pages or pagination.get('total_pages')
+                    if total_pages and current_page >= total_pages:
+                        finished = True
+                        break
                 
-                page += 1
+                if finished:
+                    # Drop read-ahead requests that have not started yet
+                    for future in futures:
+                        future.cancel()
+                    break
                 
-            except Exception as e:
-                self.logger.error(f"Error fetching page {page}: {str(e)}")
-                break
+                page = last_page + 1
         
         if not all_data:
             raise ValueError("No data extracted from paginated API")
         
         df = pd.DataFrame(all_data)
-        df['extraction_timestamp'] = datetime.now()
-        df['source_endpoint'] = endpoint
+        self._add_metadata(df, endpoint)
         
-        self.logger.info(f"Extracted {len(df)} records from {len(all_data)} pages")
+        self.logger.info(f"Extracted {len(df)} records from {pages_fetched} pages")
         return df
     
     def get_api_info(self, endpoint: str) -> Dict[str, Any]:
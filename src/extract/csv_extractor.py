@@ -1,25 +1,59 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import os
+import json
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Module logger, configured once at import and shared by every instance
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+
+# read_csv options that work with engine='pyarrow'; calls using anything else keep the default engine
+PYARROW_READ_CSV_OPTIONS = {
+    'sep', 'delimiter', 'header', 'names', 'index_col', 'usecols', 'dtype', 'dtype_backend',
+    'true_values', 'false_values', 'na_values', 'keep_default_na', 'parse_dates', 'encoding', 'quotechar',
+}
+
+# pandas' default missing-value markers; Arrow's CSV reader is given the same list (and told
+# strings may be null) so empty or 'NA' text cells come through as NaN, as with pd.read_csv
+PANDAS_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+def _arrow_convert_options(columns: List[str] = None,
+                          column_types: Dict[str, Any] = None) -> pa_csv.ConvertOptions:
+    return pa_csv.ConvertOptions(
+        include_columns=columns or [],
+        column_types=column_types or {},
+        null_values=PANDAS_NA_VALUES,
+        strings_can_be_null=True
+    )
 
 class CSVExtractor:
-    def __init__(self, data_path: str = None):
+    def __init__(self, data_path: str = None, dtype_backend: str = None, use_pyarrow_engine: bool = False):
         self.data_path = data_path or 'data/raw'
-        self.logger = self._setup_logger()
+        # Opt-in: the pyarrow parser is multithreaded but infers some dtypes differently from
+        # the default engine (ISO dates become timestamps rather than strings, for example)
+        self.use_pyarrow_engine = use_pyarrow_engine
+        # 'pyarrow' keeps columns Arrow-backed (validity bitmaps, contiguous string buffers)
+        # instead of converting them to NumPy/object dtypes
+        self.dtype_backend = dtype_backend
+        self.logger = logger
     
-    def _setup_logger(self):
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
-        return logger
+    def _to_pandas(self, table: pa.Table) -> pd.DataFrame:
+        types_mapper = pd.ArrowDtype if self.dtype_backend == 'pyarrow' else None
+        return table.to_pandas(split_blocks=True, self_destruct=True, types_mapper=types_mapper)
     
     def extract_from_csv(self, file_path: str, **kwargs) -> pd.DataFrame:
         try:
@@ -28,6 +62,14 @@ class CSVExtractor:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"CSV file not found: {file_path}")
             
+            if self.dtype_backend:
+                kwargs.setdefault('dtype_backend', self.dtype_backend)
+            
+            # Use pandas' multithreaded pyarrow parser when enabled, unless the caller picked an
+            # engine or passed an option only the C/Python engines support
+            if self.use_pyarrow_engine and 'engine' not in kwargs and set(kwargs) <= PYARROW_READ_CSV_OPTIONS:
+                kwargs['engine'] = 'pyarrow'
+            
             df = pd.read_csv(file_path, **kwargs)
             self.logger.info(f"Successfully extracted {len(df)} rows from {file_path}")
             
@@ -37,38 +79,177 @@ class CSVExtractor:
             self.logger.error(f"Error extracting from CSV {file_path}: {str(e)}")
             raise
     
+    def extract_from_csv_arrow(self, file_path: str, columns: List[str] = None,
+                               column_types: Dict[str, Any] = None) -> pd.DataFrame:
+        try:
+            self.logger.info(f"Extracting data from CSV with Arrow: {file_path}")
+            
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"CSV file not found: {file_path}")
+            
+            # Parse with Arrow's multithreaded reader; split_blocks/self_destruct let to_pandas
+            # hand columns over one at a time instead of consolidating them into a copy
+            table = pa_csv.read_csv(file_path, convert_options=_arrow_convert_options(columns, column_types))
+            df = self._to_pandas(table)
+            self.logger.info(f"Successfully extracted {len(df)} rows from {file_path}")
+            
+            return df
+            
+        except Exception as e:
+            self.logger.error(f"Error extracting from CSV {file_path}: {str(e)}")
+            raise
+    
     def extract_multiple_csv(self, file_patterns: List[str], combine: bool = True) -> pd.DataFrame:
-        dataframes = []
+        def read_one(pattern):
+            self.logger.info(f"Extracting data from CSV: {pattern}")
+            
+            if not os.path.exists(pattern):
+                raise FileNotFoundError(f"CSV file not found: {pattern}")
+            
+            table = pa_csv.read_csv(pattern,
+                                    read_options=pa_csv.ReadOptions(use_threads=True, block_size=8 << 20),
+                                    convert_options=_arrow_convert_options())
+            table = table.append_column('source_file', pa.repeat(os.path.basename(pattern), table.num_rows))
+            table = table.append_column('extraction_timestamp',
+                                        pa.repeat(pa.scalar(datetime.now(), pa.timestamp('us')), table.num_rows))
+            self.logger.info(f"Successfully extracted {table.num_rows} rows from {pattern}")
+            
+            return table
         
-        for pattern in file_patterns:
+        # Arrow's CSV reader releases the GIL, so the files are parsed side by side
+        with ThreadPoolExecutor() as executor:
+            futures = [executor.submit(read_one, pattern) for pattern in file_patterns]
+        
+        tables = []
+        
+        for pattern, future in zip(file_patterns, futures):
             try:
-                df = self.extract_from_csv(pattern)
-                df['source_file'] = os.path.basename(pattern)
-                df['extraction_timestamp'] = datetime.now()
-                dataframes.append(df)
+                tables.append(future.result())
             except Exception as e:
                 self.logger.warning(f"Failed to extract {pattern}: {str(e)}")
                 continue
         
-        if not dataframes:
+        if not tables:
             raise ValueError("No CSV files were successfully extracted")
         
         if combine:
-            combined_df = pd.concat(dataframes, ignore_index=True)
-            self.logger.info(f"Combined {len(dataframes)} CSV files into {len(combined_df)} rows")
+            # Concatenate in Arrow (missing columns become nulls, numeric types are widened) and
+            # convert to pandas once
+            try:
+                combined_df = self._to_pandas(pa.concat_tables(tables, promote_options='permissive'))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                # A column that is numeric in one file and text in another cannot be unified in
+                # Arrow; pd.concat falls back to object dtype for it instead
+                self.logger.warning(f"Could not combine CSV files in Arrow, using pandas: {str(e)}")
+                combined_df = pd.concat([self._to_pandas(table) for table in tables], ignore_index=True)
+            self.logger.info(f"Combined {len(tables)} CSV files into {len(combined_df)} rows")
             return combined_df
         else:
-            return dataframes
+            return [self._to_pandas(table) for table in tables]
+    
+    def extract_multiple_csv_chunks(self, file_patterns: List[str],
+                                    chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        # Yield the files one chunk of at most chunksize rows at a time, tagged the same way as
+        # extract_multiple_csv, so memory stays bounded by the chunk rather than the inputs
+        read_options = {'dtype_backend': self.dtype_backend} if self.dtype_backend else {}
+        
+        for pattern in file_patterns:
+            if not os.path.exists(pattern):
+                self.logger.warning(f"Failed to extract {pattern}: CSV file not found")
+                continue
+            
+            self.logger.info(f"Extracting data from CSV in chunks of {chunksize} rows: {pattern}")
+            extraction_timestamp = datetime.now()
+            
+            for chunk in pd.read_csv(pattern, chunksize=chunksize, **read_options):
+                chunk['source_file'] = os.path.basename(pattern)
+                chunk['extraction_timestamp'] = extraction_timestamp
+                yield chunk
+    
+    def convert_to_parquet(self, file_path: str, parquet_path: str = None,
+                           column_types: Dict[str, str] = None, block_size: int = 64 << 20) -> str:
+        parquet_path = parquet_path or os.path.splitext(file_path)[0] + '.parquet'
+        
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"CSV file not found: {file_path}")
+            
+            # Recorded in the Parquet metadata so a copy written with other column types is redone
+            types_signature = json.dumps({col: str(dtype) for col, dtype in sorted((column_types or {}).items())})
+            
+            # Reuse the existing Parquet copy unless the CSV (or the requested types) changed since
+            if (os.path.exists(parquet_path) and
+                    os.path.getmtime(parquet_path) >= os.path.getmtime(file_path) and
+                    (pq.read_schema(parquet_path).metadata or {}).get(b'csv_column_types') == types_signature.encode()):
+                return parquet_path
+            
+            convert_options = pa_csv.ConvertOptions(column_types=column_types or {})
+            tmp_path = parquet_path + '.tmp'
+            total_rows = 0
+            
+            # Stream the CSV through Arrow one block at a time so peak memory is bounded
+            # by block_size rather than the file size, and write each block as a row group.
+            # The output is renamed into place only once complete, so an interrupted run
+            # never leaves a partial file that looks up to date.
+            try:
+                reader = pa_csv.open_csv(
+                    file_path,
+                    read_options=pa_csv.ReadOptions(block_size=block_size),
+                    convert_options=convert_options
+                )
+                schema = reader.schema.with_metadata({b'csv_column_types': types_signature.encode()})
+                
+                with pq.ParquetWriter(tmp_path, schema, compression='snappy') as writer:
+                    for batch in reader:
+                        writer.write_batch(batch)
+                        total_rows += batch.num_rows
+            except pa.ArrowInvalid as e:
+                # The streaming reader fixes column types from the first block; a column that
+                # changes type (or is empty) further down needs the whole-file reader, which
+                # infers types across every block
+                self.logger.warning(f"Streaming conversion of {file_path} failed, reading the whole file: {str(e)}")
+                
+                table = pa_csv.read_csv(file_path, convert_options=convert_options)
+                table = table.replace_schema_metadata({b'csv_column_types': types_signature.encode()})
+                pq.write_table(table, tmp_path, compression='snappy')
+                total_rows = table.num_rows
+            
+            os.replace(tmp_path, parquet_path)
+            self.logger.info(f"Converted {total_rows} rows from {file_path} to Parquet: {parquet_path}")
+            
+            return parquet_path
+            
+        except Exception as e:
+            if os.path.exists(parquet_path + '.tmp'):
+                os.remove(parquet_path + '.tmp')
+            
+            self.logger.error(f"Error converting CSV {file_path} to Parquet: {str(e)}")
+            raise
+    
+    def _count_data_lines(self, file_path: str) -> int:
+        # Count records by scanning for newlines in 1 MB binary chunks rather than parsing the
+        # whole file; a final line without a trailing newline still counts, the header does not
+        line_count = 0
+        last_chunk = b''
+        
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                line_count += chunk.count(b'\n')
+                last_chunk = chunk
+        
+        if last_chunk and not last_chunk.endswith(b'\n'):
+            line_count += 1
+        
+        return max(line_count - 1, 0)
     
     def get_csv_info(self, file_path: str) -> Dict[str, Any]:
         try:
             df = pd.read_csv(file_path, nrows=5)
-            full_df = pd.read_csv(file_path)
             
             info = {
                 'file_path': file_path,
                 'file_size': os.path.getsize(file_path),
-                'total_rows': len(full_df),
+                'total_rows': self._count_data_lines(file_path),
                 'total_columns': len(df.columns),
                 'columns': list(df.columns),
                 'data_types': df.dtypes.to_dict(),
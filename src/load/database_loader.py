@@ -1,18 +1,105 @@
 import pandas as pd
+import numpy as np
 import sqlalchemy
 from sqlalchemy import create_engine, text, inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.types import String, Integer, Float, DateTime, Boolean
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import csv
+import io
 import os
+import weakref
+import threading
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# psycopg2's execute_values sends many rows per statement; other drivers use executemany
+try:
+    from psycopg2.extras import execute_values
+except ImportError:
+    execute_values = None
+
+# connectorx reads query results straight into columnar buffers, skipping per-row Python
+# objects; used by execute_query when installed
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
+# Backends connectorx can read from
+CONNECTORX_BACKENDS = {'postgresql', 'mysql', 'sqlite', 'mssql', 'oracle'}
+
+# Rows per to_sql chunk for each dialect when load_dataframe is not given a chunk_size
+DEFAULT_CHUNK_SIZES = {'postgresql': 50000, 'mysql': 50000, 'mariadb': 50000, 'sqlite': 5000, 'mssql': 1000}
+
+# SQL column types by dtype kind; other kinds (object, string, category) become VARCHAR
+SQL_TYPES_BY_KIND = {'i': Integer, 'u': Integer, 'f': Float, 'M': DateTime, 'b': Boolean}
+
+# Most recent load operations kept in memory for get_load_summary
+LOAD_LOG_SIZE = 10_000
+
+# Bind-parameter limits that cap how many rows fit in one multi-row INSERT
+MAX_BIND_PARAMS = {'sqlite': 999, 'mssql': 2100}
+
+def psql_insert_copy(table, conn, keys, data_iter):
+    # to_sql insertion method for PostgreSQL: stream each chunk through COPY instead of
+    # multi-row INSERT statements, so the server parses and plans once per chunk
+    with conn.connection.cursor() as cursor:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(data_iter)
+        buffer.seek(0)
+        
+        columns = ', '.join(f'"{key}"' for key in keys)
+        table_name = f"{table.schema}.{table.name}" if table.schema else table.name
+        cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+@lru_cache(maxsize=None)
+def _get_engine(database_url: str):
+    # One engine (and connection pool) per URL, shared by every DatabaseLoader in the process
+    dialect = make_url(database_url).get_dialect()
+    backend, driver = dialect.name, dialect.driver
+    options = {}
+    
+    # SQLite's pools are per-thread/per-file and take no sizing options
+    if backend != 'sqlite':
+        options.update(pool_size=16, max_overflow=8, pool_pre_ping=True, pool_recycle=1800)
+    
+    # Batch executemany at the driver so to_sql's INSERTs are not sent one row per round trip
+    if backend == 'postgresql' and driver == 'psycopg2':
+        options.update(
+            executemany_mode='values_plus_batch',
+            insertmanyvalues_page_size=10000,
+            executemany_batch_page_size=500
+        )
+    elif backend == 'postgresql' and driver == 'psycopg':
+        # psycopg 3 prepares statements server-side once they have run this many times
+        options.update(connect_args={'prepare_threshold': 5})
+    elif backend == 'mssql' and driver == 'pyodbc':
+        options.update(fast_executemany=True)
+    
+    return create_engine(database_url, **options)
 
 class DatabaseLoader:
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, engine=None, use_connectorx: bool = True):
         self.database_url = database_url
-        self.engine = create_engine(database_url)
+        self.engine = engine if engine is not None else _get_engine(database_url)
+        self.use_connectorx = use_connectorx and cx is not None and self.engine.dialect.name in CONNECTORX_BACKENDS
         self.logger = self._setup_logger()
-        self.load_log = []
+        self.load_log = deque(maxlen=LOAD_LOG_SIZE)
+        
+        # Running totals for get_load_summary, kept for every load even once the log wraps
+        self.total_loads = 0
+        self.total_rows_loaded = 0
+        self.tables_loaded = {}
+        self.operations = {}
+        self.summary_lock = threading.Lock()
+        self.known_tables = set()
+        self.columns_cache = {}
+        self.statement_cache = {}
+        self.sql_types_cache = {}
     
     def _setup_logger(self):
         logger = logging.getLogger(__name__)
@@ -26,6 +113,27 @@ class DatabaseLoader:
         
         return logger
     
+    def _statement(self, sql: str):
+        # text() clauses are built once per distinct SQL string and reused on later calls
+        if sql not in self.statement_cache:
+            self.statement_cache[sql] = text(sql)
+        return self.statement_cache[sql]
+    
+    def _table_exists(self, table_name: str) -> bool:
+        # Tables seen once are remembered, so repeated loads into them skip the catalog query
+        if table_name in self.known_tables:
+            return True
+        
+        if inspect(self.engine).has_table(table_name):
+            self.known_tables.add(table_name)
+            return True
+        
+        return False
+    
+    def invalidate_table_cache(self):
+        self.known_tables.clear()
+        self.columns_cache.clear()
+    
     def _log_load(self, operation: str, table_name: str, rows_count: int, details: str = ""):
         log_entry = {
             'timestamp': datetime.now(),
@@ -35,27 +143,50 @@ class DatabaseLoader:
             'details': details
         }
         self.load_log.append(log_entry)
-        self.logger.info(f"Load: {operation} - Table: {table_name} - Rows: {rows_count} {details}")
+        
+        with self.summary_lock:
+            self.total_loads += 1
+            self.total_rows_loaded += rows_count
+            self.tables_loaded[table_name] = True
+            self.operations[operation] = True
+        
+        self.logger.info("Load: %s - Table: %s - Rows: %s %s", operation, table_name, rows_count, details)
     
     def _infer_sql_types(self, df: pd.DataFrame) -> Dict[str, Any]:
+        # The same frame loaded into several tables is only scanned once. Entries hold a weak
+        # reference (and are dropped with the frame) so a recycled id() never matches a
+        # different frame; the columns/dtypes/length fingerprint catches frames reshaped in place.
+        fingerprint = (tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes), len(df))
+        cached = self.sql_types_cache.get(id(df))
+        
+        if cached is not None and cached[0]() is df and cached[1] == fingerprint:
+            return cached[2]
+        
         type_mapping = {}
         
-        for col in df.columns:
-            dtype = df[col].dtype
-            
-            if pd.api.types.is_integer_dtype(dtype):
-                type_mapping[col] = Integer()
-            elif pd.api.types.is_float_dtype(dtype):
-                type_mapping[col] = Float()
-            elif pd.api.types.is_datetime64_any_dtype(dtype):
-                type_mapping[col] = DateTime()
-            elif pd.api.types.is_bool_dtype(dtype):
-                type_mapping[col] = Boolean()
+        for col, dtype in df.dtypes.items():
+            # One lookup on the dtype kind (numpy and pandas extension dtypes both expose it)
+            sql_type = SQL_TYPES_BY_KIND.get(dtype.kind)
+            
+            if sql_type is not None:
+                type_mapping[col] = sql_type()
             else:
-                # For object types, use String with max length
-                max_length = df[col].astype(str).str.len().max() if not df[col].empty else 255
-                type_mapping[col] = String(max_length=max_length)
+                # For object types, use String with max length, measured without building a
+                # str-cast copy of the column; Arrow-backed strings use the vectorised .str.len()
+                if isinstance(dtype, pd.StringDtype):
+                    max_length = df[col].str.len().max()
+                else:
+                    lengths = np.fromiter(
+                        (len(v) if isinstance(v, str) else len(str(v)) for v in df[col].dropna()),
+                        dtype=np.int64
+                    )
+                    max_length = lengths.max() if len(lengths) else None
+                
+                type_mapping[col] = String(length=int(max_length) if pd.notna(max_length) else 255)
         
+        self.sql_types_cache[id(df)] = (
+            weakref.ref(df, lambda _, key=id(df): self.sql_types_cache.pop(key, None)), fingerprint, type_mapping
+        )
         return type_mapping
     
     def create_table_from_dataframe(self, df: pd.DataFrame, table_name: str, 
@@ -65,21 +196,21 @@ class DatabaseLoader:
             # Infer SQL types from DataFrame
             dtype_mapping = self._infer_sql_types(df)
             
-            # Create the table
-            df.head(0).to_sql(
-                name=table_name,
-                con=self.engine,
-                if_exists=if_exists,
-                dtype=dtype_mapping,
-                index=False
-            )
-            
-            # Add primary key if specified
-            if primary_key and primary_key in df.columns:
-                with self.engine.connect() as conn:
-                    conn.execute(text(f"ALTER TABLE {table_name} ADD PRIMARY KEY ({primary_key});"))
-                    conn.commit()
+            # Create the table and add the primary key, if specified, in one transaction
+            with self.engine.begin() as conn:
+                df.head(0).to_sql(
+                    name=table_name,
+                    con=conn,
+                    if_exists=if_exists,
+                    dtype=dtype_mapping,
+                    index=False
+                )
+                
+                if primary_key and primary_key in df.columns:
+                    conn.execute(self._statement(f"ALTER TABLE {table_name} ADD PRIMARY KEY ({primary_key});"))
             
+            self.known_tables.add(table_name)
+            self.columns_cache.pop(table_name, None)
             self._log_load('create_table', table_name, 0, f"if_exists={if_exists}, primary_key={primary_key}")
             return True
             
@@ -89,37 +220,60 @@ class DatabaseLoader:
     
     def load_dataframe(self, df: pd.DataFrame, table_name: str, 
                       if_exists: str = 'append', 
-                      chunk_size: int = 1000,
-                      create_table: bool = True) -> bool:
+                      chunk_size: Optional[int] = None,
+                      create_table: bool = True,
+                      max_workers: int = 1) -> bool:
         try:
             rows_loaded = len(df)
+            dialect = self.engine.dialect.name
+            
+            # PostgreSQL takes the rows over COPY; other databases get multi-row INSERTs
+            method = psql_insert_copy if dialect == 'postgresql' else 'multi'
+            
+            if not chunk_size:
+                chunk_size = DEFAULT_CHUNK_SIZES.get(dialect, 10000)
+            
+            # A multi-row INSERT binds one parameter per cell, so keep each chunk under the driver's limit
+            if method == 'multi' and dialect in MAX_BIND_PARAMS and len(df.columns):
+                chunk_size = max(min(chunk_size, MAX_BIND_PARAMS[dialect] // len(df.columns)), 1)
             
             # Create table if it doesn't exist and create_table is True
             if create_table:
-                inspector = inspect(self.engine)
-                if not inspector.has_table(table_name):
+                if not self._table_exists(table_name):
                     self.create_table_from_dataframe(df, table_name, if_exists='fail')
             
-            # Load data in chunks
-            if chunk_size and len(df) > chunk_size:
-                for i in range(0, len(df), chunk_size):
-                    chunk = df.iloc[i:i+chunk_size]
-                    chunk.to_sql(
-                        name=table_name,
-                        con=self.engine,
-                        if_exists=if_exists if i == 0 else 'append',
-                        index=False,
-                        method='multi'
-                    )
+            if max_workers > 1 and len(df) > chunk_size:
+                # Write the first chunk (which applies if_exists), then the rest concurrently over
+                # pooled connections so their round trips overlap. Each chunk commits on its own,
+                # so a failure can leave the earlier chunks loaded.
+                df.iloc[:chunk_size].to_sql(
+                    name=table_name, con=self.engine, if_exists=if_exists, index=False, method=method
+                )
+                
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(df.iloc[start:start + chunk_size].to_sql, name=table_name,
+                                        con=self.engine, if_exists='append', index=False, method=method)
+                        for start in range(chunk_size, len(df), chunk_size)
+                    ]
+                
+                for future in futures:
+                    future.result()
             else:
+                # Load data in chunks; to_sql slices the frame itself
                 df.to_sql(
                     name=table_name,
                     con=self.engine,
                     if_exists=if_exists,
                     index=False,
-                    method='multi'
+                    chunksize=chunk_size,
+                    method=method
                 )
             
+            # 'replace' recreates the table from the frame, so its cached columns may be stale
+            if if_exists == 'replace':
+                self.columns_cache.pop(table_name, None)
+            
             self._log_load('load_dataframe', table_name, rows_loaded, 
                          f"if_exists={if_exists}, chunk_size={chunk_size}")
             return True
@@ -136,35 +290,66 @@ class DatabaseLoader:
                 raise ValueError("conflict_columns must be specified for upsert operation")
             
             # Create table if it doesn't exist
-            inspector = inspect(self.engine)
-            if not inspector.has_table(table_name):
+            if not self._table_exists(table_name):
                 self.create_table_from_dataframe(df, table_name, if_exists='fail')
             
+            # A single INSERT cannot hit the same conflict target twice, so keep the last row per key
+            deduplicated_df = df.drop_duplicates(subset=conflict_columns, keep='last')
+            if len(deduplicated_df) < len(df):
+                self.logger.warning(f"Dropped {len(df) - len(deduplicated_df)} rows with duplicate "
+                                    f"{conflict_columns} before upserting into {table_name}")
+                df = deduplicated_df
+            
             # Get all columns if update_columns not specified
             if not update_columns:
                 update_columns = [col for col in df.columns if col not in conflict_columns]
             
             # Build upsert query
+            column_list = ', '.join(df.columns)
             conflict_cols_str = ', '.join(conflict_columns)
-            update_cols_str = ', '.join([f"{col} = EXCLUDED.{col}" for col in update_columns])
+            dialect = self.engine.dialect
             
-            # Load to temporary table first
-            temp_table = f"{table_name}_temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            df.to_sql(name=temp_table, con=self.engine, if_exists='replace', index=False)
+            if dialect.name in ('mysql', 'mariadb'):
+                update_cols = update_columns or conflict_columns[:1]
+                on_conflict = f"ON DUPLICATE KEY UPDATE {', '.join(f'{col} = VALUES({col})' for col in update_cols)}"
+            elif update_columns:
+                update_cols_str = ', '.join([f"{col} = EXCLUDED.{col}" for col in update_columns])
+                on_conflict = f"ON CONFLICT ({conflict_cols_str}) DO UPDATE SET {update_cols_str}"
+            else:
+                on_conflict = f"ON CONFLICT ({conflict_cols_str}) DO NOTHING"
             
-            # Perform upsert
-            upsert_query = f"""
-            INSERT INTO {table_name} ({', '.join(df.columns)})
-            SELECT {', '.join(df.columns)}
-            FROM {temp_table}
-            ON CONFLICT ({conflict_cols_str}) DO UPDATE SET
-                {update_cols_str};
-            """
+            # Send the rows straight into the upsert as multi-row VALUES pages instead of
+            # staging them in a temporary table first; missing values go as NULL
+            rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
             
-            with self.engine.connect() as conn:
-                conn.execute(text(upsert_query))
-                conn.execute(text(f"DROP TABLE {temp_table};"))
-                conn.commit()
+            # Executing the statement with an empty parameter list is an error, and there is
+            # nothing to write anyway
+            if not rows:
+                self._log_load('upsert_dataframe', table_name, 0, 
+                             f"conflict_columns={conflict_columns}")
+                return True
+            
+            if dialect.name == 'postgresql' and dialect.driver == 'psycopg2' and execute_values is not None:
+                conn = self.engine.raw_connection()
+                try:
+                    cursor = conn.cursor()
+                    execute_values(
+                        cursor, f"INSERT INTO {table_name} ({column_list}) VALUES %s {on_conflict}",
+                        rows, page_size=1000
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.close()
+            else:
+                placeholders = ', '.join(f":p{i}" for i in range(len(df.columns)))
+                upsert_query = f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders}) {on_conflict}"
+                
+                with self.engine.connect() as conn:
+                    conn.execute(text(upsert_query), [{f"p{i}": value for i, value in enumerate(row)} for row in rows])
+                    conn.commit()
             
             self._log_load('upsert_dataframe', table_name, len(df), 
                          f"conflict_columns={conflict_columns}")
@@ -174,14 +359,145 @@ class DatabaseLoader:
             self.logger.error(f"Error upserting data to {table_name}: {str(e)}")
             return False
     
-    def execute_query(self, query: str, params: Dict = None) -> pd.DataFrame:
+    def _build_copy_filter(self, columns: List[str], filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        conditions = []
+        params = []
+        
+        for column, condition in (filters or {}).items():
+            if column not in columns:
+                continue
+            
+            column = self.engine.dialect.identifier_preparer.quote(column)
+            
+            if isinstance(condition, dict):
+                if 'min' in condition:
+                    conditions.append(f"{column} >= %s")
+                    params.append(condition['min'])
+                if 'max' in condition:
+                    conditions.append(f"{column} <= %s")
+                    params.append(condition['max'])
+                if 'values' in condition:
+                    conditions.append(f"{column} = ANY(%s)")
+                    params.append(list(condition['values']))
+                if 'not_values' in condition:
+                    conditions.append(f"NOT ({column} = ANY(%s))")
+                    params.append(list(condition['not_values']))
+            else:
+                conditions.append(f"{column} = %s")
+                params.append(condition)
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where_clause, params
+    
+    def copy_csv_to_table(self, file_path: str, table_name: str,
+                          load_strategy: str = 'append',
+                          filters: Dict[str, Any] = None,
+                          buffer_size: int = 1 << 20,
+                          key_columns: List[str] = None) -> int:
         try:
-            with self.engine.connect() as conn:
-                result = conn.execute(text(query), params or {})
-                df = pd.DataFrame(result.fetchall(), columns=result.keys())
+            # 'replace' upserts on the key rather than truncating: other tables reference these
+            # rows by foreign key, so PostgreSQL refuses a TRUNCATE (and CASCADE would empty them)
+            if load_strategy == 'replace' and not key_columns:
+                raise ValueError(f"load_strategy='replace' needs key_columns to upsert into {table_name}")
+            
+            # Parse the header as CSV (quoted names may contain commas) and drop any BOM;
+            # names are quoted where needed since they come from the file
+            with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+                columns = [col.strip() for col in next(csv.reader(f))]
+            
+            quote = self.engine.dialect.identifier_preparer.quote
+            column_list = ', '.join(quote(col) for col in columns)
+            staging_table = f"stg_{table_name.split('.')[-1]}"
+            where_clause, params = self._build_copy_filter(columns, filters)
+            
+            # Stamp rows with the same lineage columns the pandas CSV path adds, unless the
+            # file already carries them
+            lineage = {
+                col: value for col, value in
+                (('source_file', os.path.basename(file_path)), ('extraction_timestamp', datetime.now()))
+                if col not in columns
+            }
+            insert_list = ', '.join([column_list] + list(lineage))
+            select_list = ', '.join([column_list] + ['%s'] * len(lineage))
+            
+            conn = self.engine.raw_connection()
+            try:
+                cursor = conn.cursor()
                 
-                self._log_load('execute_query', 'custom_query', len(df), f"query_length={len(query)}")
-                return df
+                # Stage the raw file with COPY, typed by the target's columns but without its
+                # constraints, then move it across in one INSERT ... SELECT
+                cursor.execute(
+                    f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS "
+                    f"SELECT {column_list} FROM {table_name} WITH NO DATA"
+                )
+                # Stream raw bytes in large blocks; copy_expert otherwise reads 8 KB at a time
+                with open(file_path, 'rb', buffering=buffer_size) as f:
+                    cursor.copy_expert(
+                        f"COPY {staging_table} ({column_list}) FROM STDIN WITH (FORMAT csv, HEADER true)", f,
+                        size=buffer_size
+                    )
+                
+                if load_strategy == 'replace':
+                    # Rows in the file overwrite the stored ones; rows missing from the file are
+                    # kept, since dependent tables may still reference them
+                    update_columns = [quote(col) for col in columns if col not in key_columns] + list(lineage)
+                    conflict_action = (
+                        "DO UPDATE SET " + ', '.join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+                        if update_columns else "DO NOTHING"
+                    )
+                    conflict_clause = f"ON CONFLICT ({', '.join(quote(col) for col in key_columns)}) {conflict_action}"
+                else:
+                    conflict_clause = "ON CONFLICT DO NOTHING"
+                
+                cursor.execute(
+                    f"INSERT INTO {table_name} ({insert_list}) "
+                    f"SELECT {select_list} FROM {staging_table} {where_clause} "
+                    f"{conflict_clause}",
+                    list(lineage.values()) + params
+                )
+                rows_loaded = cursor.rowcount
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+            
+            self._log_load('copy_csv_to_table', table_name, rows_loaded,
+                         f"file={file_path}, load_strategy={load_strategy}")
+            return rows_loaded
+        
+        except Exception as e:
+            self.logger.error(f"Error copying {file_path} to {table_name}: {str(e)}")
+            raise
+    
+    def _read_with_connectorx(self, query: str, params: Dict = None) -> pd.DataFrame:
+        # connectorx takes neither SQLAlchemy driver names nor bind parameters, so connect
+        # with the bare backend URL and render the parameters into the SQL as literals
+        url = make_url(self.database_url)
+        url = url.set(drivername=url.get_backend_name()).render_as_string(hide_password=False)
+        statement = text(query).bindparams(**params) if params else text(query)
+        sql = str(statement.compile(dialect=self.engine.dialect, compile_kwargs={'literal_binds': True}))
+        
+        return cx.read_sql(url, sql, return_type='arrow').to_pandas(split_blocks=True, self_destruct=True)
+    
+    def execute_query(self, query: str, params: Dict = None) -> pd.DataFrame:
+        try:
+            df = None
+            
+            if self.use_connectorx:
+                try:
+                    df = self._read_with_connectorx(query, params)
+                except Exception as e:
+                    self.logger.warning(f"connectorx could not run the query, using SQLAlchemy: {str(e)}")
+            
+            if df is None:
+                with self.engine.connect() as conn:
+                    result = conn.execute(text(query), params or {})
+                    df = pd.DataFrame(result.fetchall(), columns=result.keys())
+            
+            self._log_load('execute_query', 'custom_query', len(df), f"query_length={len(query)}")
+            return df
                 
         except Exception as e:
             self.logger.error(f"Error executing query: {str(e)}")
@@ -189,25 +505,18 @@ class DatabaseLoader:
     
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
         try:
-            inspector = inspect(self.engine)
-            
-            if not inspector.has_table(table_name):
+            if not self._table_exists(table_name):
                 return {'error': f'Table {table_name} does not exist'}
             
-            # Get column information
-            columns = inspector.get_columns(table_name)
-            
-            # Get row count
-            row_count_query = f"SELECT COUNT(*) as count FROM {table_name}"
-            with self.engine.connect() as conn:
-                result = conn.execute(text(row_count_query))
-                row_count = result.fetchone()[0]
+            # Get column information (cached until the table is recreated or the cache invalidated)
+            if table_name not in self.columns_cache:
+                self.columns_cache[table_name] = inspect(self.engine).get_columns(table_name)
+            columns = self.columns_cache[table_name]
             
-            # Get sample data
-            sample_query = f"SELECT * FROM {table_name} LIMIT 5"
+            # Get row count and sample data over a single connection
             with self.engine.connect() as conn:
-                result = conn.execute(text(sample_query))
-                sample_data = [dict(row._mapping) for row in result]
+                row_count = conn.execute(self._statement(f"SELECT COUNT(*) as count FROM {table_name}")).scalar_one()
+                sample_data = [dict(row) for row in conn.execute(self._statement(f"SELECT * FROM {table_name} LIMIT 5")).mappings()]
             
             info = {
                 'table_name': table_name,
@@ -233,9 +542,8 @@ class DatabaseLoader:
             # Create backup table
             backup_query = f"CREATE TABLE {backup_table} AS SELECT * FROM {table_name};"
             
-            with self.engine.connect() as conn:
+            with self.engine.begin() as conn:
                 conn.execute(text(backup_query))
-                conn.commit()
             
             self._log_load('backup_table', backup_table, 0, f"original_table={table_name}")
             return True
@@ -246,18 +554,23 @@ class DatabaseLoader:
     
     def get_load_summary(self) -> Dict[str, Any]:
         return {
-            'total_loads': len(self.load_log),
-            'load_log': self.load_log,
+            'total_loads': self.total_loads,
+            'load_log': list(self.load_log),
             'summary': {
-                'total_rows_loaded': sum(log['rows_count'] for log in self.load_log),
-                'tables_loaded': list(set(log['table_name'] for log in self.load_log)),
-                'operations': list(set(log['operation'] for log in self.load_log))
+                'total_rows_loaded': self.total_rows_loaded,
+                'tables_loaded': list(self.tables_loaded),
+                'operations': list(self.operations)
             }
         }
     
     def close(self):
-        if hasattr(self, 'engine'):
-            self.engine.dispose()
+        # The engine is either the process-wide one from _get_engine or one the caller passed
+        # in, so it is not disposed here: that would tear down the pool every other loader
+        # shares. Only this loader's own cached state is released.
+        self.known_tables.clear()
+        self.columns_cache.clear()
+        self.statement_cache.clear()
+        self.sql_types_cache.clear()
 
 if __name__ == "__main__":
     # Example usage
@@ -5,6 +5,10 @@ from typing import Dict, List, Any, Optional
 import json
 import os
 import sys
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import queue
+import threading
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -14,18 +18,36 @@ from src.extract.api_extractor import APIExtractor
 from src.transform.data_transformer import DataTransformer
 from src.load.database_loader import DatabaseLoader
 from config.config import config
+from sqlalchemy import text
+
+# Most recent pipeline steps kept in memory for the run summary
+PIPELINE_LOG_SIZE = 10_000
+
+# Run summaries go in with one prepared INSERT rather than a one-row DataFrame load
+ETL_JOB_LOG_INSERT = text("""
+    INSERT INTO analytics.etl_job_logs
+    (job_name, job_type, start_time, end_time, status, records_processed, records_loaded, metadata)
+    VALUES (:job_name, :job_type, :start_time, :end_time, :status, :records_processed, :records_loaded,
+            CAST(:metadata AS JSONB))
+""")
 
 class ETLPipeline:
-    def __init__(self, pipeline_name: str = "default_pipeline"):
+    def __init__(self, pipeline_name: str = "default_pipeline", engine=None):
         self.pipeline_name = pipeline_name
         self.logger = self._setup_logger()
-        self.pipeline_log = []
+        self.pipeline_log = deque(maxlen=PIPELINE_LOG_SIZE)
+        
+        # Running step totals for get_pipeline_summary, kept even once the log wraps
+        self.total_steps = 0
+        self.status_counts = Counter()
+        self.start_time = None
+        self.summary_lock = threading.Lock()
         
         # Initialize components
         self.csv_extractor = CSVExtractor()
         self.api_extractor = APIExtractor(config.API_BASE_URL, config.API_KEY)
         self.transformer = DataTransformer()
-        self.db_loader = DatabaseLoader(config.DATABASE_URL)
+        self.db_loader = DatabaseLoader(config.DATABASE_URL, engine=engine)
         
     def _setup_logger(self):
         logger = logging.getLogger(f"{__name__}.{self.pipeline_name}")
@@ -49,8 +71,14 @@ class ETLPipeline:
         }
         self.pipeline_log.append(log_entry)
         
+        with self.summary_lock:
+            self.total_steps += 1
+            self.status_counts[status] += 1
+            self.start_time = self.start_time or log_entry['timestamp']
+        
+        # Arguments are only formatted if the record is actually emitted
         status_emoji = "✅" if status == "success" else "❌" if status == "error" else "⏳"
-        self.logger.info(f"{status_emoji} {step}: {status} - {details}")
+        self.logger.info("%s %s: %s - %s", status_emoji, step, status, details)
     
     def extract_csv_data(self, file_paths: List[str], table_name: str) -> pd.DataFrame:
         try:
@@ -95,10 +123,8 @@ class ETLPipeline:
         try:
             self._log_pipeline_step("transform_data", "started", {"table": table_name})
             
-            transformed_df = df.copy()
-            
-            # Apply standard transformations
-            transformed_df = self.transformer.clean_data(transformed_df)
+            # Apply standard transformations; each step returns a new frame, so df is left untouched
+            transformed_df = self.transformer.clean_data(df)
             transformed_df = self.transformer.standardize_columns(transformed_df)
             
             # Apply custom transformations if provided
@@ -148,9 +174,7 @@ class ETLPipeline:
                 "rows_to_load": len(df)
             })
             
-            success = self.db_loader.load_dataframe(
-                df, table_name, if_exists=load_strategy, chunk_size=1000
-            )
+            success = self.db_loader.load_dataframe(df, table_name, if_exists=load_strategy)
             
             if success:
                 self._log_pipeline_step("load_data", "success", {
@@ -201,7 +225,123 @@ class ETLPipeline:
             self.logger.error(f"❌ CSV pipeline failed: {str(e)}")
             return False
     
-    def run_api_pipeline(self, endpoint: str, table_name: str, 
+    def run_csv_copy_pipeline(self, file_paths: List[str], table_name: str,
+                             transformation_config: Dict = None,
+                             load_strategy: str = 'append',
+                             key_columns: List[str] = None) -> bool:
+        transformation_config = transformation_config or {}
+        
+        # Features and aggregations need pandas; type mapping is handled by the target
+        # column types and filters are pushed into the INSERT ... SELECT
+        if 'features' in transformation_config or 'aggregation' in transformation_config:
+            return self.run_csv_pipeline(file_paths, table_name, transformation_config, load_strategy)
+        
+        try:
+            self.logger.info(f"🚀 Starting CSV COPY pipeline for table: {table_name}")
+            start_time = datetime.now()
+            total_rows = 0
+            
+            self._log_pipeline_step("copy_csv", "started", {"files": file_paths, "table": table_name})
+            
+            for i, file_path in enumerate(file_paths):
+                total_rows += self.db_loader.copy_csv_to_table(
+                    file_path, table_name,
+                    load_strategy=load_strategy if i == 0 else 'append',
+                    filters=transformation_config.get('filters'),
+                    key_columns=key_columns
+                )
+            
+            duration = (datetime.now() - start_time).total_seconds()
+            
+            self._log_pipeline_step("copy_csv", "success", {
+                "rows_loaded": total_rows,
+                "table": table_name,
+                "files_processed": len(file_paths),
+                "duration_seconds": duration
+            })
+            self.logger.info(f"✅ CSV COPY pipeline completed successfully in {duration:.2f} seconds")
+            
+            return True
+        
+        except Exception as e:
+            self._log_pipeline_step("copy_csv", "error", {"error": str(e)})
+            self.logger.error(f"❌ CSV COPY pipeline failed: {str(e)}")
+            return False
+    
+    def run_csv_chunked_pipeline(self, file_paths: List[str], table_name: str,
+                                transformation_config: Dict = None,
+                                load_strategy: str = 'append',
+                                chunksize: int = 100_000) -> bool:
+        transformation_config = transformation_config or {}
+        
+        # Aggregations need every row at once; everything else is applied chunk by chunk
+        # (so duplicates are only removed within a chunk)
+        if 'aggregation' in transformation_config:
+            return self.run_csv_pipeline(file_paths, table_name, transformation_config, load_strategy)
+        
+        try:
+            self.logger.info(f"🚀 Starting chunked CSV pipeline for table: {table_name}")
+            start_time = datetime.now()
+            total_rows = 0
+            chunks_loaded = 0
+            
+            # A producer thread extracts and transforms up to two chunks ahead of the loader, so
+            # file reads, pandas work and database round trips overlap in bounded memory
+            chunks = queue.Queue(maxsize=2)
+            stop = threading.Event()
+            
+            def produce():
+                try:
+                    for chunk in self.csv_extractor.extract_multiple_csv_chunks(file_paths, chunksize):
+                        if stop.is_set():
+                            break
+                        chunks.put(self.transform_data(chunk, table_name, transformation_config))
+                finally:
+                    chunks.put(None)
+            
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                producer = executor.submit(produce)
+                finished = False
+                
+                try:
+                    while True:
+                        chunk = chunks.get()
+                        if chunk is None:
+                            finished = True
+                            break
+                        
+                        strategy = load_strategy if chunks_loaded == 0 else 'append'
+                        if not self.load_data(chunk, table_name, strategy):
+                            raise RuntimeError(f"Loading chunk {chunks_loaded + 1} into {table_name} failed")
+                        
+                        chunks_loaded += 1
+                        total_rows += len(chunk)
+                finally:
+                    # Unblock and stop the producer if loading ended early
+                    stop.set()
+                    while not finished:
+                        finished = chunks.get() is None
+                
+                producer.result()
+            
+            duration = (datetime.now() - start_time).total_seconds()
+            
+            self._log_pipeline_step("csv_chunked_pipeline", "success", {
+                "table": table_name,
+                "duration_seconds": duration,
+                "total_rows": total_rows,
+                "chunks": chunks_loaded
+            })
+            self.logger.info(f"✅ Chunked CSV pipeline completed successfully in {duration:.2f} seconds")
+            
+            return True
+        
+        except Exception as e:
+            self._log_pipeline_step("csv_chunked_pipeline", "error", {"error": str(e)})
+            self.logger.error(f"❌ Chunked CSV pipeline failed: {str(e)}")
+            return False
+    
+    def run_api_pipeline(self, endpoint: str, table_name: str,
                         params: Dict = None,
                         transformation_config: Dict = None,
                         load_strategy: str = 'append') -> bool:
@@ -238,6 +378,40 @@ class ETLPipeline:
             self.logger.error(f"❌ API pipeline failed: {str(e)}")
             return False
     
+    def _run_job(self, job_name: str, job_config: Dict) -> bool:
+        self.logger.info(f"📋 Processing job: {job_name}")
+        
+        job_type = job_config.get('type', 'csv')
+        table_name = job_config.get('table_name')
+        
+        if job_type == 'csv':
+            file_paths = job_config.get('file_paths', [])
+            transformation_config = job_config.get('transformations', {})
+            load_strategy = job_config.get('load_strategy', 'append')
+            
+            # Large inputs can opt into streaming by giving a chunksize
+            if job_config.get('chunksize'):
+                return self.run_csv_chunked_pipeline(
+                    file_paths, table_name, transformation_config, load_strategy, job_config['chunksize']
+                )
+            
+            return self.run_csv_pipeline(
+                file_paths, table_name, transformation_config, load_strategy
+            )
+        
+        elif job_type == 'api':
+            endpoint = job_config.get('endpoint')
+            params = job_config.get('params', {})
+            transformation_config = job_config.get('transformations', {})
+            load_strategy = job_config.get('load_strategy', 'append')
+            
+            return self.run_api_pipeline(
+                endpoint, table_name, params, transformation_config, load_strategy
+            )
+        
+        self.logger.error(f"❌ Unknown job type: {job_type}")
+        return False
+    
     def run_full_pipeline(self, pipeline_config: Dict) -> Dict[str, bool]:
         results = {}
         
@@ -245,40 +419,40 @@ class ETLPipeline:
         pipeline_start = datetime.now()
         
         try:
-            for job_name, job_config in pipeline_config.items():
-                self.logger.info(f"📋 Processing job: {job_name}")
-                
-                job_type = job_config.get('type', 'csv')
-                table_name = job_config.get('table_name')
-                
-                if job_type == 'csv':
-                    file_paths = job_config.get('file_paths', [])
-                    transformation_config = job_config.get('transformations', {})
-                    load_strategy = job_config.get('load_strategy', 'append')
+            # Jobs are I/O-bound (HTTP, database) and independent unless they list
+            # 'dependencies', so they run on a thread pool. A job starts once all of its
+            # dependencies have succeeded and is marked failed without running if any fails.
+            pending = dict(pipeline_config)
+            running = {}
+            
+            with ThreadPoolExecutor(max_workers=max(min(8, len(pipeline_config)), 1)) as executor:
+                while pending or running:
+                    for job_name, job_config in list(pending.items()):
+                        dependencies = job_config.get('dependencies', [])
+                        
+                        if any(dep in results and not results[dep] for dep in dependencies):
+                            self.logger.error(f"❌ Job {job_name} skipped, a dependency failed")
+                            results[job_name] = False
+                            del pending[job_name]
+                        elif all(results.get(dep) for dep in dependencies):
+                            running[executor.submit(self._run_job, job_name, job_config)] = job_name
+                            del pending[job_name]
                     
-                    success = self.run_csv_pipeline(
-                        file_paths, table_name, transformation_config, load_strategy
-                    )
+                    if not running:
+                        # Whatever is left depends on unknown jobs or on each other
+                        for job_name in pending:
+                            self.logger.error(f"❌ Job {job_name} has unresolvable dependencies")
+                            results[job_name] = False
+                        break
                     
-                elif job_type == 'api':
-                    endpoint = job_config.get('endpoint')
-                    params = job_config.get('params', {})
-                    transformation_config = job_config.get('transformations', {})
-                    load_strategy = job_config.get('load_strategy', 'append')
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
                     
-                    success = self.run_api_pipeline(
-                        endpoint, table_name, params, transformation_config, load_strategy
-                    )
-                
-                else:
-                    self.logger.error(f"❌ Unknown job type: {job_type}")
-                    success = False
-                
-                results[job_name] = success
-                
-                if not success:
-                    self.logger.error(f"❌ Job {job_name} failed, stopping pipeline")
-                    break
+                    for future in done:
+                        job_name = running.pop(future)
+                        results[job_name] = future.result()
+                        
+                        if not results[job_name]:
+                            self.logger.error(f"❌ Job {job_name} failed")
         
         except Exception as e:
             self.logger.error(f"❌ Full pipeline failed: {str(e)}")
@@ -306,21 +480,20 @@ class ETLPipeline:
             log_data = {
                 'job_name': self.pipeline_name,
                 'job_type': 'full_pipeline',
-                'start_time': self.pipeline_log[0]['timestamp'] if self.pipeline_log else datetime.now(),
+                'start_time': self.start_time or datetime.now(),
                 'end_time': datetime.now(),
                 'status': 'success' if all(results.values()) else 'partial_success' if any(results.values()) else 'failed',
                 'records_processed': sum(log['details'].get('rows_extracted', 0) for log in self.pipeline_log if 'rows_extracted' in log['details']),
                 'records_loaded': sum(log['details'].get('rows_loaded', 0) for log in self.pipeline_log if 'rows_loaded' in log['details']),
-                'metadata': {
+                'metadata': json.dumps({
                     'pipeline_results': results,
                     'duration_seconds': duration,
-                    'total_steps': len(self.pipeline_log)
-                }
+                    'total_steps': self.total_steps
+                })
             }
             
-            # Create a DataFrame for the log entry
-            log_df = pd.DataFrame([log_data])
-            self.db_loader.load_dataframe(log_df, 'etl_job_logs', if_exists='append')
+            with self.db_loader.engine.begin() as conn:
+                conn.execute(ETL_JOB_LOG_INSERT, log_data)
             
         except Exception as e:
             self.logger.warning(f"Failed to log pipeline to database: {str(e)}")
@@ -328,12 +501,12 @@ class ETLPipeline:
     def get_pipeline_summary(self) -> Dict[str, Any]:
         return {
             'pipeline_name': self.pipeline_name,
-            'total_steps': len(self.pipeline_log),
-            'pipeline_log': self.pipeline_log,
+            'total_steps': self.total_steps,
+            'pipeline_log': list(self.pipeline_log),
             'summary': {
-                'successful_steps': sum(1 for log in self.pipeline_log if log['status'] == 'success'),
-                'failed_steps': sum(1 for log in self.pipeline_log if log['status'] == 'error'),
-                'start_time': self.pipeline_log[0]['timestamp'] if self.pipeline_log else None,
+                'successful_steps': self.status_counts['success'],
+                'failed_steps': self.status_counts['error'],
+                'start_time': self.start_time,
                 'end_time': self.pipeline_log[-1]['timestamp'] if self.pipeline_log else None
             }
         }
@@ -1,14 +1,35 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable
 from datetime import datetime, timedelta
 import re
+import time
+import threading
+
+# Characters replaced by underscores when converting column names to snake_case
+SNAKE_CASE_PATTERN = re.compile(r'[^a-zA-Z0-9_]')
 
 class DataTransformer:
-    def __init__(self):
+    def __init__(self, track_history: bool = True, downcast: bool = False):
         self.logger = self._setup_logger()
+        self.track_history = track_history
+        self.downcast = downcast
         self.transformation_log = []
+        # One transformer may be shared by threads transforming different frames
+        self.log_lock = threading.Lock()
+        # Running totals kept by _log_transformation so the summary never walks the log
+        self.total_transformations = 0
+        self.total_rows_processed = 0
+        self.total_rows_output = 0
+        self.initial_shape = None
+        self.final_shape = None
+        # Log entries carry a monotonic perf_counter_ns reading; wall-clock times are only
+        # derived from this pair of epochs when a summary is requested
+        self.epoch_wall = datetime.now()
+        self.epoch_ns = time.perf_counter_ns()
+        self.category_cache = {}
     
     def _setup_logger(self):
         logger = logging.getLogger(__name__)
@@ -23,15 +44,27 @@ class DataTransformer:
         return logger
     
     def _log_transformation(self, operation: str, input_shape: Tuple, output_shape: Tuple, details: str = ""):
-        log_entry = {
-            'timestamp': datetime.now(),
-            'operation': operation,
-            'input_shape': input_shape,
-            'output_shape': output_shape,
-            'details': details
-        }
-        self.transformation_log.append(log_entry)
-        self.logger.info(f"Transformation: {operation} - {input_shape} -> {output_shape} {details}")
+        # Pipelines pushing many small frames through can pass track_history=False to skip
+        # keeping a log entry per call; the message is only formatted if INFO is enabled
+        with self.log_lock:
+            self.total_transformations += 1
+            self.total_rows_processed += input_shape[0]
+            self.total_rows_output += output_shape[0]
+            self.final_shape = output_shape
+            
+            if self.initial_shape is None:
+                self.initial_shape = input_shape
+            
+            if self.track_history:
+                self.transformation_log.append({
+                    'ts_ns': time.perf_counter_ns(),
+                    'operation': operation,
+                    'input_shape': input_shape,
+                    'output_shape': output_shape,
+                    'details': details
+                })
+        
+        self.logger.info("Transformation: %s - %s -> %s %s", operation, input_shape, output_shape, details)
     
     def clean_data(self, df: pd.DataFrame, 
                    remove_duplicates: bool = True,
@@ -39,47 +72,112 @@ class DataTransformer:
                    missing_threshold: float = 0.5) -> pd.DataFrame:
         original_shape = df.shape
         
-        cleaned_df = df.copy()
+        # A shallow copy rather than a deep one: the steps below all return new frames, and this
+        # keeps the result a distinct frame even when none of them applies
+        cleaned_df = df.copy(deep=False)
         
         # Remove duplicates
         if remove_duplicates:
-            cleaned_df = cleaned_df.drop_duplicates()
+            cleaned_df = self._drop_duplicates(cleaned_df)
         
         # Handle missing values
         if handle_missing == 'drop':
+            # One isnull pass serves both steps: its column sums pick the columns to keep and
+            # its rows (over those columns) pick the rows to drop, so dropna doesn't rescan
+            missing = cleaned_df.isnull()
+            
             # Drop columns with too many missing values
-            missing_ratio = cleaned_df.isnull().sum() / len(cleaned_df)
-            cols_to_keep = missing_ratio[missing_ratio <= missing_threshold].index
-            cleaned_df = cleaned_df[cols_to_keep]
+            missing_ratio = missing.sum() / len(cleaned_df)
+            cols_to_keep = (missing_ratio <= missing_threshold).to_numpy()
             
             # Drop rows with any missing values
-            cleaned_df = cleaned_df.dropna()
+            rows_to_keep = ~missing.to_numpy()[:, cols_to_keep].any(axis=1)
+            cleaned_df = cleaned_df.loc[rows_to_keep, cols_to_keep]
         elif handle_missing == 'fill':
-            # Fill numeric columns with median
+            # Fill numeric columns with median and categorical columns with mode, collected
+            # into one mapping so fillna walks the columns once
             numeric_cols = cleaned_df.select_dtypes(include=[np.number]).columns
-            cleaned_df[numeric_cols] = cleaned_df[numeric_cols].fillna(cleaned_df[numeric_cols].median())
+            fill_values = cleaned_df[numeric_cols].median().to_dict()
             
-            # Fill categorical columns with mode
             categorical_cols = cleaned_df.select_dtypes(include=['object']).columns
             for col in categorical_cols:
                 mode_val = cleaned_df[col].mode()
                 if len(mode_val) > 0:
-                    cleaned_df[col] = cleaned_df[col].fillna(mode_val[0])
+                    fill_values[col] = mode_val.iat[0]
+            
+            cleaned_df = cleaned_df.fillna(fill_values)
+        
+        if self.downcast:
+            cleaned_df = self._downcast_numeric(cleaned_df)
         
         self._log_transformation('clean_data', original_shape, cleaned_df.shape, 
                                f"missing_threshold={missing_threshold}, handle_missing={handle_missing}")
         return cleaned_df
     
+    def _drop_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Frames whose columns are all Arrow-backed are deduplicated with Arrow's vectorised hash
+        # group-by: the smallest row number per distinct row marks its first occurrence, and
+        # taking those rows in order gives exactly what drop_duplicates() keeps
+        if len(df.columns) == 0 or not all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes):
+            return df.drop_duplicates()
+        
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            row_column = '__row_number'
+            
+            while row_column in table.column_names:
+                row_column = '_' + row_column
+            
+            first_rows = (table.append_column(row_column, pa.array(np.arange(len(df))))
+                          .group_by(table.column_names)
+                          .aggregate([(row_column, 'min')]))
+            return df.iloc[np.sort(first_rows.column(f"{row_column}_min").to_numpy())]
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            # Key types Arrow can't hash (or non-string column names) fall back to pandas
+            self.logger.debug(f"Arrow deduplication unavailable, using pandas: {str(e)}")
+            return df.drop_duplicates()
+    
+    def _downcast_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Narrow integer and float columns to the smallest dtype that holds their values, so the
+        # memory-bound stages after cleaning (filters, groupbys, encodings) scan fewer bytes
+        numeric_cols = df.select_dtypes(include=['integer', 'floating']).columns
+        
+        if len(numeric_cols) == 0:
+            return df
+        
+        downcast_df = df.copy(deep=False)
+        
+        for col in numeric_cols:
+            kind = 'integer' if pd.api.types.is_integer_dtype(df[col].dtype) else 'float'
+            downcast_df[col] = pd.to_numeric(df[col], downcast=kind)
+        
+        return downcast_df
+    
+    def clean_data_fast(self, df: pd.DataFrame,
+                        required_columns: List[str],
+                        key_columns: List[str] = None) -> pd.DataFrame:
+        # Lightweight cleaning for already-typed (Parquet/Arrow) input: only rows
+        # missing a required value are dropped, and duplicates are detected on the
+        # key columns (whole rows when no key is given)
+        original_shape = df.shape
+        
+        cleaned_df = df.dropna(subset=required_columns).drop_duplicates(subset=key_columns)
+        
+        self._log_transformation('clean_data_fast', original_shape, cleaned_df.shape,
+                               f"required_columns={required_columns}, key_columns={key_columns}")
+        return cleaned_df
+    
     def standardize_columns(self, df: pd.DataFrame, 
                            naming_convention: str = 'snake_case') -> pd.DataFrame:
         original_shape = df.shape
         
-        standardized_df = df.copy()
+        # Renaming only touches the column index, so a shallow copy is enough
+        standardized_df = df.copy(deep=False)
         
         if naming_convention == 'snake_case':
             # Convert to snake_case
             standardized_df.columns = [
-                re.sub(r'[^a-zA-Z0-9_]', '_', col).lower().strip('_')
+                SNAKE_CASE_PATTERN.sub('_', col).lower().strip('_')
                 for col in standardized_df.columns
             ]
         elif naming_convention == 'lower':
@@ -95,46 +193,85 @@ class DataTransformer:
                           type_mapping: Dict[str, str] = None) -> pd.DataFrame:
         original_shape = df.shape
         
-        converted_df = df.copy()
+        # Shallow copy: each converted column replaces the shared one rather than writing into it
+        converted_df = df.copy(deep=False)
         
         if type_mapping:
-            for col, dtype in type_mapping.items():
-                if col in converted_df.columns:
-                    try:
-                        if dtype == 'datetime':
-                            converted_df[col] = pd.to_datetime(converted_df[col])
-                        elif dtype == 'category':
-                            converted_df[col] = converted_df[col].astype('category')
-                        else:
-                            converted_df[col] = converted_df[col].astype(dtype)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to convert {col} to {dtype}: {str(e)}")
+            mapping = {col: dtype for col, dtype in type_mapping.items() if col in df.columns}
+            astype_mapping = {col: dtype for col, dtype in mapping.items() if dtype != 'datetime'}
+            converted = {}
+            
+            for col in (col for col, dtype in mapping.items() if dtype == 'datetime'):
+                try:
+                    values = pd.to_datetime(df[col])
+                    
+                    # Keep Arrow-backed frames Arrow-backed rather than dropping to datetime64
+                    if isinstance(df[col].dtype, pd.ArrowDtype):
+                        values = values.astype('timestamp[ns][pyarrow]')
+                    
+                    # Only stored once both steps succeed, so a failure leaves the column unconverted
+                    converted[col] = values
+                except Exception as e:
+                    self.logger.warning(f"Failed to convert {col} to datetime: {str(e)}")
+            
+            # Convert the remaining columns (including 'category') with one astype call; if any
+            # column fails, retry them one at a time so only the failing ones are left unconverted
+            if astype_mapping:
+                try:
+                    converted.update(df[list(astype_mapping)].astype(astype_mapping).items())
+                except Exception:
+                    for col, dtype in astype_mapping.items():
+                        try:
+                            converted[col] = df[col].astype(dtype)
+                        except Exception as e:
+                            self.logger.warning(f"Failed to convert {col} to {dtype}: {str(e)}")
+            
+            for col, values in converted.items():
+                converted_df[col] = values
         
         self._log_transformation('convert_data_types', original_shape, converted_df.shape,
                                f"type_mapping={type_mapping}")
         return converted_df
     
-    def filter_data(self, df: pd.DataFrame, 
-                   filters: Dict[str, Any]) -> pd.DataFrame:
-        original_shape = df.shape
-        
-        filtered_df = df.copy()
+    def compile_filters(self, filters: Dict[str, Any]) -> Callable[[pd.DataFrame], np.ndarray]:
+        # Interpret the filter spec once into (column, check) pairs; the returned predicate can
+        # then be applied to any number of batches, ANDing every check into one mask
+        checks = []
         
         for column, condition in filters.items():
-            if column not in filtered_df.columns:
-                continue
-                
             if isinstance(condition, dict):
                 if 'min' in condition:
-                    filtered_df = filtered_df[filtered_df[column] >= condition['min']]
+                    checks.append((column, lambda values, bound=condition['min']: values >= bound))
                 if 'max' in condition:
-                    filtered_df = filtered_df[filtered_df[column] <= condition['max']]
+                    checks.append((column, lambda values, bound=condition['max']: values <= bound))
                 if 'values' in condition:
-                    filtered_df = filtered_df[filtered_df[column].isin(condition['values'])]
+                    checks.append((column, lambda values, allowed=condition['values']: values.isin(allowed)))
                 if 'not_values' in condition:
-                    filtered_df = filtered_df[~filtered_df[column].isin(condition['not_values'])]
+                    checks.append((column, lambda values, excluded=condition['not_values']: ~values.isin(excluded)))
             else:
-                filtered_df = filtered_df[filtered_df[column] == condition]
+                checks.append((column, lambda values, expected=condition: values == expected))
+        
+        def predicate(df: pd.DataFrame) -> np.ndarray:
+            mask = np.ones(len(df), dtype=bool)
+            
+            for column, check in checks:
+                if column in df.columns:
+                    # Missing comparison results (nullable dtypes) drop the row, as boolean indexing does
+                    np.logical_and(mask, check(df[column]).to_numpy(dtype=bool, na_value=False), out=mask)
+            
+            return mask
+        
+        return predicate
+    
+    def filter_data(self, df: pd.DataFrame, 
+                   filters: Dict[str, Any]) -> pd.DataFrame:
+        original_shape = df.shape
+        
+        # One mask from the filter predicate, so the rows are gathered once at the end
+        # instead of slicing the whole frame again for each condition
+        mask = self.compile_filters(filters)(df)
+        # Nothing filtered out still returns a new frame (a shallow copy), never the input itself
+        filtered_df = df.copy(deep=False) if mask.all() else df.loc[mask]
         
         self._log_transformation('filter_data', original_shape, filtered_df.shape,
                                f"filters={filters}")
@@ -144,51 +281,141 @@ class DataTransformer:
                        feature_config: Dict[str, Dict]) -> pd.DataFrame:
         original_shape = df.shape
         
-        enhanced_df = df.copy()
+        # Shallow copy: new feature columns are added to this frame only
+        enhanced_df = df.copy(deep=False)
+        derived_features = {}
         
         for feature_name, config in feature_config.items():
             feature_type = config.get('type')
             
+            # Evaluate each run of consecutive derived features together before moving on, so
+            # features later in the config can still use their results
+            if feature_type != 'derived' and derived_features:
+                self._add_derived_features(enhanced_df, derived_features)
+                derived_features = {}
+            
             if feature_type == 'derived':
                 # Create derived features from existing columns
                 expression = config.get('expression')
                 if expression:
-                    try:
-                        enhanced_df[feature_name] = enhanced_df.eval(expression)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to create feature {feature_name}: {str(e)}")
+                    derived_features[feature_name] = expression
             
             elif feature_type == 'date_features':
                 # Extract date features from datetime columns
                 date_col = config.get('column')
                 if date_col and date_col in enhanced_df.columns:
-                    enhanced_df[feature_name + '_year'] = enhanced_df[date_col].dt.year
-                    enhanced_df[feature_name + '_month'] = enhanced_df[date_col].dt.month
-                    enhanced_df[feature_name + '_day'] = enhanced_df[date_col].dt.day
-                    enhanced_df[feature_name + '_weekday'] = enhanced_df[date_col].dt.weekday
+                    # Read the components off one DatetimeIndex over the column's values rather
+                    # than building a .dt accessor and a Series for each of them
+                    dates = pd.DatetimeIndex(enhanced_df[date_col])
+                    components = {
+                        '_year': (dates.year, 'int16'),
+                        '_month': (dates.month, 'int8'),
+                        '_day': (dates.day, 'int8'),
+                        '_weekday': (dates.weekday, 'int8'),
+                    }
+                    # Missing dates leave the components as float NaN, which can't be narrowed
+                    narrow = self.downcast and not dates.hasnans
+                    
+                    for suffix, (values, narrow_dtype) in components.items():
+                        values = values.to_numpy()
+                        enhanced_df[feature_name + suffix] = values.astype(narrow_dtype) if narrow else values
             
             elif feature_type == 'categorical_encoding':
                 # One-hot encode categorical columns
                 col = config.get('column')
                 if col and col in enhanced_df.columns:
-                    dummies = pd.get_dummies(enhanced_df[col], prefix=feature_name)
+                    # Scatter the category codes into a preallocated indicator matrix in one
+                    # step rather than building a column per category; missing values stay all-False
+                    categorical = self._to_categorical(enhanced_df[col])
+                    codes = categorical.codes
+                    present = codes >= 0
+                    
+                    indicators = np.zeros((len(codes), len(categorical.categories)), dtype=bool)
+                    indicators[np.flatnonzero(present), codes[present]] = True
+                    
+                    dummies = pd.DataFrame(indicators, index=enhanced_df.index,
+                                           columns=[f"{feature_name}_{category}" for category in categorical.categories])
                     enhanced_df = pd.concat([enhanced_df, dummies], axis=1)
+            
+            elif feature_type == 'binary_encoding':
+                # For high-cardinality columns: the category code written out in
+                # ceil(log2(k + 1)) bit columns (0 is reserved for missing) instead of k indicators
+                col = config.get('column')
+                if col and col in enhanced_df.columns:
+                    categorical = self._to_categorical(enhanced_df[col])
+                    codes = categorical.codes.astype(np.int64) + 1
+                    n_bits = max(int(np.ceil(np.log2(len(categorical.categories) + 1))), 1)
+                    
+                    bits = (codes[:, None] >> np.arange(n_bits)) & 1
+                    enhanced_df = enhanced_df.assign(**{
+                        f"{feature_name}_bit{i}": bits[:, i].astype(bool) for i in range(n_bits)
+                    })
+        
+        if derived_features:
+            self._add_derived_features(enhanced_df, derived_features)
         
         self._log_transformation('create_features', original_shape, enhanced_df.shape,
                                f"features_created={list(feature_config.keys())}")
         return enhanced_df
     
+    def _add_derived_features(self, df: pd.DataFrame, expressions: Dict[str, str]):
+        # New columns with plain names are added by one multi-line eval, parsed and evaluated in
+        # a single pass; inplace only ever appends columns here, so the shared data is untouched
+        if (len(expressions) > 1 and
+                all(name.isidentifier() and name not in df.columns for name in expressions)):
+            try:
+                df.eval("\n".join(f"{name} = {expression}" for name, expression in expressions.items()),
+                        inplace=True)
+                return
+            except Exception:
+                # Fall through and evaluate one at a time, so only the failing features are skipped
+                pass
+        
+        for feature_name, expression in expressions.items():
+            try:
+                df[feature_name] = df.eval(expression)
+            except Exception as e:
+                self.logger.warning(f"Failed to create feature {feature_name}: {str(e)}")
+    
+    def _to_categorical(self, series: pd.Series) -> pd.Categorical:
+        # Encode against the categories learnt by fit() when there are any, so every batch gets
+        # the same feature columns (unseen values encode as missing); otherwise discover them here
+        dtype = self.category_cache.get(series.name)
+        return pd.Categorical(series, dtype=dtype) if dtype is not None else pd.Categorical(series)
+    
+    def fit(self, df: pd.DataFrame, feature_config: Dict[str, Dict]) -> 'DataTransformer':
+        for config in feature_config.values():
+            col = config.get('column')
+            if config.get('type') in ('categorical_encoding', 'binary_encoding') and col in df.columns:
+                self.category_cache[col] = pd.CategoricalDtype(pd.Categorical(df[col]).categories)
+        
+        return self
+    
+    def transform(self, df: pd.DataFrame, feature_config: Dict[str, Dict]) -> pd.DataFrame:
+        return self.create_features(df, feature_config)
+    
     def aggregate_data(self, df: pd.DataFrame, 
                       group_by: List[str], 
                       aggregations: Dict[str, List[str]]) -> pd.DataFrame:
         original_shape = df.shape
         
         try:
-            aggregated_df = df.groupby(group_by).agg(aggregations).reset_index()
+            # Named aggregations come out with flat <column>_<function> names, so there is no
+            # MultiIndex to flatten afterwards
+            named_aggregations = {}
+            for col, funcs in aggregations.items():
+                func_names = [func if isinstance(func, str) else func.__name__ for func in funcs]
+                # Repeated names within a column (e.g. two lambdas) are numbered the way pandas
+                # numbers them, <lambda_0>, <lambda_1>, instead of overwriting each other
+                seen = {}
+                for func, func_name in zip(funcs, func_names):
+                    if func_names.count(func_name) > 1:
+                        seen[func_name] = seen.get(func_name, -1) + 1
+                        func_name = f"{func_name[:-1]}_{seen[func_name]}>" if func_name.endswith('>') \
+                            else f"{func_name}_{seen[func_name]}"
+                    named_aggregations[f"{col}_{func_name}"] = pd.NamedAgg(column=col, aggfunc=func)
             
-            # Flatten multi-level column names
-            aggregated_df.columns = ['_'.join(col).strip() if col[1] else col[0] 
-                                   for col in aggregated_df.columns.values]
+            aggregated_df = df.groupby(group_by, as_index=False).agg(**named_aggregations)
             
             self._log_transformation('aggregate_data', original_shape, aggregated_df.shape,
                                    f"group_by={group_by}, aggregations={aggregations}")
@@ -201,17 +428,21 @@ class DataTransformer:
     def validate_data(self, df: pd.DataFrame, 
                      validation_rules: Dict[str, Dict]) -> Tuple[pd.DataFrame, Dict]:
         validation_results = {}
-        validated_df = df.copy()
+        # Nothing is modified during validation, so the returned frame only needs a shallow copy
+        validated_df = df.copy(deep=False)
         
         for column, rules in validation_rules.items():
             if column not in df.columns:
                 continue
-                
+            
+            # Each check reduces to one NumPy boolean mask counted with count_nonzero; missing
+            # comparison results (nullable dtypes) count as passing, as .sum() skipped them
+            values = df[column]
             column_results = {}
             
             # Check for null values
             if 'not_null' in rules and rules['not_null']:
-                null_count = df[column].isnull().sum()
+                null_count = np.count_nonzero(values.isnull().to_numpy())
                 column_results['null_check'] = {
                     'passed': null_count == 0,
                     'null_count': null_count,
@@ -221,7 +452,10 @@ class DataTransformer:
             # Check value range
             if 'range' in rules:
                 min_val, max_val = rules['range']
-                out_of_range = ((df[column] < min_val) | (df[column] > max_val)).sum()
+                out_of_range = np.count_nonzero(np.logical_or(
+                    (values < min_val).to_numpy(dtype=bool, na_value=False),
+                    (values > max_val).to_numpy(dtype=bool, na_value=False)
+                ))
                 column_results['range_check'] = {
                     'passed': out_of_range == 0,
                     'out_of_range_count': out_of_range,
@@ -230,12 +464,12 @@ class DataTransformer:
             
             # Check allowed values
             if 'allowed_values' in rules:
-                invalid_values = ~df[column].isin(rules['allowed_values'])
-                invalid_count = invalid_values.sum()
+                invalid_values = ~values.isin(rules['allowed_values']).to_numpy(dtype=bool, na_value=True)
+                invalid_count = np.count_nonzero(invalid_values)
                 column_results['allowed_values_check'] = {
                     'passed': invalid_count == 0,
                     'invalid_count': invalid_count,
-                    'invalid_values': df[column][invalid_values].unique().tolist() if invalid_count > 0 else []
+                    'invalid_values': values[invalid_values].unique().tolist() if invalid_count > 0 else []
                 }
             
             validation_results[column] = column_results
@@ -244,13 +478,17 @@ class DataTransformer:
     
     def get_transformation_summary(self) -> Dict[str, Any]:
         return {
-            'total_transformations': len(self.transformation_log),
-            'transformation_log': self.transformation_log,
+            'total_transformations': self.total_transformations,
+            'transformation_log': [
+                {'timestamp': self.epoch_wall + timedelta(microseconds=(log['ts_ns'] - self.epoch_ns) / 1000),
+                 **{key: value for key, value in log.items() if key != 'ts_ns'}}
+                for log in self.transformation_log
+            ],
             'summary': {
-                'initial_shape': self.transformation_log[0]['input_shape'] if self.transformation_log else None,
-                'final_shape': self.transformation_log[-1]['output_shape'] if self.transformation_log else None,
-                'total_rows_processed': sum(log['input_shape'][0] for log in self.transformation_log),
-                'total_rows_output': sum(log['output_shape'][0] for log in self.transformation_log)
+                'initial_shape': self.initial_shape,
+                'final_shape': self.final_shape,
+                'total_rows_processed': self.total_rows_processed,
+                'total_rows_output': self.total_rows_output
             }
         }
 
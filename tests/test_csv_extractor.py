@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.extract.csv_extractor import CSVExtractor
+
+
+@pytest.fixture
+def csv_with_missing_values(tmp_path):
+    path = tmp_path / 'people.csv'
+    path.write_text('id,name,age\n1,,30\n2,bob,\n3,NA,40\n4,N/A,50\n')
+    return str(path)
+
+
+def test_arrow_extract_nulls_match_read_csv(csv_with_missing_values):
+    expected = pd.read_csv(csv_with_missing_values)
+
+    df = CSVExtractor().extract_from_csv_arrow(csv_with_missing_values)
+
+    assert df.isna().sum().to_dict() == expected.isna().sum().to_dict()
+    assert df['name'].isna().tolist() == [True, False, True, True]
+
+
+def test_multiple_csv_nulls_match_read_csv(csv_with_missing_values, tmp_path):
+    other = tmp_path / 'more_people.csv'
+    other.write_text('id,name,age\n5,,\n6,eve,60\n')
+    expected = pd.concat([pd.read_csv(csv_with_missing_values), pd.read_csv(other)], ignore_index=True)
+    
+    df = CSVExtractor().extract_multiple_csv([csv_with_missing_values, str(other)])
+    
+    assert df[expected.columns].isna().sum().to_dict() == expected.isna().sum().to_dict()
+
+
+def test_multiple_csv_with_mixed_column_types(tmp_path):
+    numbers = tmp_path / 'numbers.csv'
+    numbers.write_text('code\n1\n2\n')
+    letters = tmp_path / 'letters.csv'
+    letters.write_text('code\na\nb\n')
+    
+    df = CSVExtractor().extract_multiple_csv([str(numbers), str(letters)])
+    
+    assert df['code'].tolist() == [1, 2, 'a', 'b']
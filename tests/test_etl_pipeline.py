@@ -0,0 +1,70 @@
+import logging
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip('dotenv')
+
+from src.orchestration.etl_pipeline import ETLPipeline
+
+
+def make_pipeline(job_results):
+    """An ETLPipeline whose jobs just report the given result, with no database behind it"""
+    pipeline = ETLPipeline.__new__(ETLPipeline)
+    pipeline.pipeline_name = 'test_pipeline'
+    pipeline.logger = logging.getLogger('test_pipeline')
+    pipeline.started = []
+    lock = threading.Lock()
+    
+    def run_job(job_name, job_config):
+        with lock:
+            pipeline.started.append(job_name)
+        return job_results[job_name]
+    
+    pipeline._run_job = run_job
+    pipeline._log_pipeline_to_database = lambda results, duration: None
+    return pipeline
+
+
+def test_dependent_job_runs_after_its_dependencies():
+    pipeline = make_pipeline({'users': True, 'products': True, 'sales': True})
+    
+    results = pipeline.run_full_pipeline({
+        'sales': {'dependencies': ['users', 'products']},
+        'users': {},
+        'products': {},
+    })
+    
+    assert results == {'users': True, 'products': True, 'sales': True}
+    assert pipeline.started[-1] == 'sales'
+
+
+def test_job_is_skipped_when_a_dependency_fails():
+    pipeline = make_pipeline({'users': False, 'products': True, 'sales': True})
+    
+    results = pipeline.run_full_pipeline({
+        'users': {},
+        'products': {},
+        'sales': {'dependencies': ['users', 'products']},
+    })
+    
+    assert results == {'users': False, 'products': True, 'sales': False}
+    assert 'sales' not in pipeline.started
+
+
+def test_unresolvable_dependencies_fail_without_running():
+    pipeline = make_pipeline({'users': True, 'a': True, 'b': True, 'sales': True})
+    
+    results = pipeline.run_full_pipeline({
+        'users': {},
+        'a': {'dependencies': ['b']},
+        'b': {'dependencies': ['a']},
+        'sales': {'dependencies': ['missing_job']},
+    })
+    
+    assert results == {'users': True, 'a': False, 'b': False, 'sales': False}
+    assert pipeline.started == ['users']